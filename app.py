@@ -5,17 +5,30 @@ Tracklist.io Flask Application
 A web application that serves tracklist data with YouTube and Discogs links.
 """
 
+import itertools
 import json
+import logging
 import os
 import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from flask import Flask, render_template, jsonify, request, redirect, url_for, flash, Response
+from sqlalchemy import func
+from sqlalchemy.orm import lazyload
 from werkzeug.utils import secure_filename
 from load_env import load_env
 from ocr_processor import OCRProcessor
 from models import db, Tracklist, Track
 from search_manager import SearchManager
 
+try:
+    # Optional: orjson parses and serializes the tracklist JSON several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'  # Change this in production
 app.config['UPLOAD_FOLDER'] = 'uploads'
@@ -23,6 +36,13 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///tracklists.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Number of tracks searched concurrently within a single tracklist. Together
+# with SEARCH_WORKERS (tracklists searched at once, below) up to
+# SEARCH_WORKERS x TRACK_SEARCH_WORKERS tracks are in flight (16 by default),
+# each fanning out to every platform; the crawlers' per-platform rate limits
+# still space the actual requests, so this bounds threads, not request rate
+TRACK_SEARCH_WORKERS = 4
+
 # Create upload directory if it doesn't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
@@ -35,21 +55,83 @@ if load_env():
 
 # Initialize processors after environment is loaded
 ocr_processor = OCRProcessor()
-search_manager = SearchManager(discogs_token=os.environ.get('DISCOGS_TOKEN'))
+search_manager = SearchManager(
+    discogs_token=os.environ.get('DISCOGS_TOKEN'),
+    min_confidence=float(os.environ.get('MIN_MATCH_CONFIDENCE', 0.3))
+)
+
+# Background tracklist searches queue on a bounded pool instead of a thread each;
+# SEARCH_WORKERS tracklists run at once (see TRACK_SEARCH_WORKERS for the total)
+search_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('SEARCH_WORKERS', 4)))
+
+# Progress notifications for the SSE endpoint - bumped whenever a search reports progress.
+# Versions come from one ever-increasing counter, so a stream never sees a value repeat.
+progress_condition = threading.Condition()
+progress_versions = {}
+_progress_counter = itertools.count(1)
+
+# Finished searches keep their version this long (well past the streams' 30s
+# heartbeat) so every waiting stream sees the final bump, then are forgotten
+PROGRESS_VERSION_TTL = 300
+_finished_progress = OrderedDict()  # tracklist id -> time.monotonic() it finished, oldest first
+
+# Live (status, progress) of running searches, ahead of what has been committed to the DB
+live_progress = {}
+
+# Searches only commit their progress to the DB every this many percent
+PROGRESS_COMMIT_STEP = 10
+
+def notify_progress(tracklist_id, status, progress):
+    """Record a search's live progress and wake any progress streams waiting on it."""
+    with progress_condition:
+        now = time.monotonic()
+        progress_versions[tracklist_id] = next(_progress_counter)
+        _finished_progress.pop(tracklist_id, None)
+        if status in ('completed', 'failed'):
+            # Terminal states are already committed, so streams can read them from the DB
+            live_progress.pop(tracklist_id, None)
+            _finished_progress[tracklist_id] = now
+        else:
+            live_progress[tracklist_id] = (status, progress)
+        
+        # Forget versions of searches that finished long ago
+        while _finished_progress:
+            finished_id, finished_at = next(iter(_finished_progress.items()))
+            if now - finished_at < PROGRESS_VERSION_TTL:
+                break
+            del _finished_progress[finished_id]
+            progress_versions.pop(finished_id, None)
+        
+        progress_condition.notify_all()
+
+# Parsed tracklist files keyed by filename -> (mtime_ns, data)
+_tracklists_cache = {}
 
 def load_tracklists():
-    """Load tracklist data from JSON file."""
+    """Load tracklist data from JSON file, reusing the last parse while the file is unchanged."""
     # Look for enhanced data first, then fall back to basic data
     input_files = ['tracklists_enhanced.json', 'tracklists_with_youtube.json', 'extracted_tracklists.json']
     
     for filename in input_files:
-        if os.path.exists(filename):
-            try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"⚠️  Could not read {filename}: {e}")
-                continue
+        try:
+            mtime_ns = os.stat(filename).st_mtime_ns
+        except OSError:
+            continue
+        
+        cached = _tracklists_cache.get(filename)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        
+        try:
+            with open(filename, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
+        except Exception as e:
+            print(f"⚠️  Could not read {filename}: {e}")
+            continue
+        
+        _tracklists_cache[filename] = (mtime_ns, data)
+        return data
     
     return []
 
@@ -86,37 +168,46 @@ def process_tracklist_search(tracklist_id):
                 tracklist.search_status = 'processing'
                 tracklist.search_progress = 0
                 db.session.commit()
+                notify_progress(tracklist_id, 'processing', 0)
                 
                 tracks = Track.query.filter_by(tracklist_id=tracklist_id).all()
                 total_tracks = len(tracks)
+                track_names = [track.track_name for track in tracks]
                 
-                for i, track in enumerate(tracks):
-                    # Search for platform links
-                    search_result = search_manager.search_track(track.track_name)
-                    
-                    # Update track with results
-                    platforms = search_result.get('platforms', {})
-                    
-                    if platforms.get('youtube', {}).get('url'):
-                        track.youtube_url = platforms['youtube']['url']
-                        track.youtube_confidence = platforms['youtube']['confidence']
+                # Search several tracks at once; results come back in track order
+                # and are applied here, so the ORM objects stay on this thread
+                with ThreadPoolExecutor(max_workers=TRACK_SEARCH_WORKERS) as executor:
+                    search_results = executor.map(search_manager.search_track, track_names)
                     
-                    if platforms.get('discogs', {}).get('url'):
-                        track.discogs_url = platforms['discogs']['url']
-                        track.discogs_confidence = platforms['discogs']['confidence']
-                    
-                    if platforms.get('bandcamp', {}).get('url'):
-                        track.bandcamp_url = platforms['bandcamp']['url']
-                        track.bandcamp_confidence = platforms['bandcamp']['confidence']
-                    
-                    # Update progress
-                    tracklist.search_progress = int((i + 1) / total_tracks * 100)
-                    db.session.commit()
+                    for i, (track, search_result) in enumerate(zip(tracks, search_results)):
+                        # Update track with results
+                        platforms = search_result.get('platforms', {})
+                        
+                        if platforms.get('youtube', {}).get('url'):
+                            track.youtube_url = platforms['youtube']['url']
+                            track.youtube_confidence = platforms['youtube']['confidence']
+                        
+                        if platforms.get('discogs', {}).get('url'):
+                            track.discogs_url = platforms['discogs']['url']
+                            track.discogs_confidence = platforms['discogs']['confidence']
+                        
+                        if platforms.get('bandcamp', {}).get('url'):
+                            track.bandcamp_url = platforms['bandcamp']['url']
+                            track.bandcamp_confidence = platforms['bandcamp']['confidence']
+                        
+                        # Report progress live, but only commit (and fsync) the track
+                        # updates each time another PROGRESS_COMMIT_STEP percent is done
+                        progress = int((i + 1) / total_tracks * 100)
+                        if progress // PROGRESS_COMMIT_STEP > tracklist.search_progress // PROGRESS_COMMIT_STEP:
+                            tracklist.search_progress = progress
+                            db.session.commit()
+                        notify_progress(tracklist_id, 'processing', progress)
                 
                 # Mark as completed
                 tracklist.search_status = 'completed'
                 tracklist.search_progress = 100
                 db.session.commit()
+                notify_progress(tracklist_id, 'completed', 100)
                 
                 print(f"✅ Completed search for tracklist {tracklist_id}")
                 
@@ -126,21 +217,32 @@ def process_tracklist_search(tracklist_id):
                 if tracklist:
                     tracklist.search_status = 'failed'
                     db.session.commit()
+                notify_progress(tracklist_id, 'failed', None)
     
-    # Start the search in a background thread
-    thread = threading.Thread(target=run_search)
-    thread.daemon = True
-    thread.start()
+    # Queue the search on the background pool
+    search_executor.submit(run_search)
 
 @app.route('/')
 def index():
     """Main tracklist page - shows list of all tracklists."""
-    tracklists = Tracklist.query.order_by(Tracklist.created_at.desc()).all()
+    # Only the track counts are shown here, so skip eager-loading the tracks themselves
+    tracklists = (
+        Tracklist.query.options(lazyload(Tracklist.tracks))
+        .order_by(Tracklist.created_at.desc())
+        .all()
+    )
+    
+    # Count tracks per tracklist in one grouped query rather than lazy-loading each list
+    track_counts = dict(
+        db.session.query(Track.tracklist_id, func.count(Track.id))
+        .group_by(Track.tracklist_id)
+        .all()
+    )
     stats = {
         'total_tracklists': len(tracklists),
-        'total_tracks': sum(len(tl.tracks) for tl in tracklists)
+        'total_tracks': sum(track_counts.values())
     }
-    return render_template('index.html', tracklists=tracklists, stats=stats)
+    return render_template('index.html', tracklists=tracklists, stats=stats, track_counts=track_counts)
 
 @app.route('/tracklist/<tracklist_id>')
 def view_tracklist(tracklist_id):
@@ -153,23 +255,37 @@ def tracklist_progress(tracklist_id):
     """Server-Sent Events endpoint for tracklist search progress."""
     def generate():
         while True:
-            with app.app_context():
-                tracklist = Tracklist.query.get(tracklist_id)
-                if not tracklist:
-                    break
-                
-                data = {
-                    'status': tracklist.search_status,
-                    'progress': tracklist.search_progress
-                }
-                
-                yield f"data: {json.dumps(data)}\n\n"
-                
-                if tracklist.search_status in ['completed', 'failed']:
-                    break
+            # Read the version before the DB so an update landing in between isn't missed
+            with progress_condition:
+                seen_version = progress_versions.get(tracklist_id, 0)
+                live = live_progress.get(tracklist_id)
             
-            import time
-            time.sleep(2)  # Check every 2 seconds
+            # Running searches report progress in memory; otherwise fall back to the DB
+            if live:
+                status, progress = live
+            else:
+                with app.app_context():
+                    tracklist = Tracklist.query.options(lazyload(Tracklist.tracks)).get(tracklist_id)
+                    if not tracklist:
+                        break
+                    status, progress = tracklist.search_status, tracklist.search_progress
+            
+            data = {
+                'status': status,
+                'progress': progress
+            }
+            
+            yield f"data: {json.dumps(data)}\n\n"
+            
+            if status in ['completed', 'failed']:
+                break
+            
+            # Sleep until the search reports progress, re-sending as a heartbeat every 30s
+            with progress_condition:
+                progress_condition.wait_for(
+                    lambda: progress_versions.get(tracklist_id, 0) != seen_version,
+                    timeout=30
+                )
     
     return Response(generate(), mimetype='text/event-stream')
 
@@ -203,6 +319,9 @@ def retrigger_search(tracklist_id):
 def api_tracklists():
     """API endpoint for tracklist data."""
     tracklists = load_tracklists()
+    if orjson:
+        # Serializing every tracklist is the bulk of this request; orjson does it in one C call
+        return Response(orjson.dumps(tracklists, option=orjson.OPT_SORT_KEYS), mimetype='application/json')
     return jsonify(tracklists)
 
 @app.route('/api/stats')
@@ -250,13 +369,13 @@ def upload_tracklist():
                 db.session.add(tracklist)
                 db.session.flush()  # Get the ID
                 
-                # Create track records
-                for track_name in tracklist_data['tracks']:
-                    track = Track(
-                        track_name=track_name,
-                        tracklist_id=tracklist.id
-                    )
-                    db.session.add(track)
+                # Create track records in a single executemany INSERT
+                track_rows = [
+                    {'track_name': track_name, 'tracklist_id': tracklist.id}
+                    for track_name in tracklist_data['tracks']
+                ]
+                if track_rows:
+                    db.session.execute(Track.__table__.insert(), track_rows)
                 
                 db.session.commit()
                 
@@ -288,18 +407,26 @@ if __name__ == '__main__':
     print("🎵 Starting Tracklist.io Flask Server")
     print("=" * 50)
     
+    # Show crawler search progress on the console
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     # Initialize database
     with app.app_context():
         db.create_all()
+        
+        # create_all() leaves existing tables alone, so add any indexes they're missing
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(db.engine, checkfirst=True)
         print("✅ Database initialized")
     
     # Check if we have data
     with app.app_context():
-        tracklists = Tracklist.query.all()
-        if tracklists:
+        total_tracklists = Tracklist.query.count()
+        if total_tracklists:
             stats = {
-                'total_tracklists': len(tracklists),
-                'total_tracks': sum(len(tl.tracks) for tl in tracklists)
+                'total_tracklists': total_tracklists,
+                'total_tracks': db.session.query(func.count(Track.id)).scalar()
             }
             print(f"📊 Loaded {stats['total_tracklists']} tracklists with {stats['total_tracks']} tracks")
         else:
@@ -310,4 +437,9 @@ if __name__ == '__main__':
     print("   Local: http://localhost:8000")
     print("   Press Ctrl+C to stop")
     
+    # Connect to the platforms ahead of the first search. The debug reloader runs
+    # this block in a watcher process too; only the serving child warms up.
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        search_manager.warm_up()
+    
     app.run(debug=True, host='0.0.0.0', port=8000)
\ No newline at end of file
@@ -4,9 +4,10 @@ Crawlers Package
 Music platform crawlers for searching tracks across different platforms.
 """
 
-from .base import BaseCrawler
+from .base import BaseCrawler, search_all, search_all_async, collect_results, cancel_when_confident
 from .youtube import YouTubeCrawler
 from .discogs import DiscogsCrawler
 from .bandcamp import BandcampCrawler
 
-__all__ = ['BaseCrawler', 'YouTubeCrawler', 'DiscogsCrawler', 'BandcampCrawler']
+__all__ = ['BaseCrawler', 'YouTubeCrawler', 'DiscogsCrawler', 'BandcampCrawler', 'search_all', 'search_all_async',
+           'collect_results', 'cancel_when_confident']
@@ -4,14 +4,57 @@ Bandcamp Crawler
 Searches Bandcamp for music tracks using web scraping.
 """
 
+import logging
 import re
+from functools import lru_cache
 from urllib.parse import quote, urljoin
 from .base import BaseCrawler
 
+logger = logging.getLogger(__name__)
+
+
+# Query cleanup in one pass: (re)mix parentheticals are dropped along with any
+# junk before them, and other runs of unwanted characters and whitespace are
+# collapsed to one space
+_RE_QUERY_JUNK = re.compile(
+    r'[^\w\-\(\)\[\]&\.\']*\([^)]*mix[^)]*\)|[^\w\-\(\)\[\]&\.\']+',
+    re.IGNORECASE
+)
+_RE_WORDS = re.compile(r'\w+')
+
+# Bandcamp search results are in a specific structure: each result is an
+# <li class="searchresult"> item. The page is split at those items so the
+# field patterns below only ever scan a single result.
+_RE_RESULT_OPEN = re.compile(r'<li[^>]*class="[^"]*searchresult', re.IGNORECASE)
+_RE_HREF = re.compile(r'href="([^"]+)"')
+_RE_RESULT_HEADING = re.compile(r'class="[^"]*heading[^"]*"[^>]*>\s*(?:<a[^>]*>)?([^<]*)', re.IGNORECASE)
+_RE_RESULT_SUBHEAD = re.compile(r'class="[^"]*subhead[^"]*"[^>]*>([^<]*)', re.IGNORECASE)
+
+# Result URLs that point at tags, labels or fans rather than music
+_RE_URL_SKIP = re.compile(r'/(?:tag|label|fan)/', re.IGNORECASE)
+
+# Fallback patterns for any Bandcamp links and result headings
+_RE_BANDCAMP_LINK = re.compile(r'href="(https://[^"]*\.bandcamp\.com/[^"]*)"')
+_RE_HEADING = re.compile(r'<[^>]*class="[^"]*heading[^"]*"[^>]*>([^<]+)</[^>]*>')
+
+
+def _replace_query_junk(match) -> str:
+    """Drop (re)mix parentheticals; collapse other junk runs to a space."""
+    return '' if match.group().endswith(')') else ' '
+
+
+def _has_result_list(body: bytearray) -> bool:
+    """Whether the whole search results list has been read."""
+    start = body.find(b'result-items')
+    return start != -1 and body.find(b'</ul>', start) != -1
+
 
 class BandcampCrawler(BaseCrawler):
     """Bandcamp music crawler using web scraping."""
     
+    # Bandcamp blocks bursts quickly, so its requests are always spaced out
+    REQUEST_BURST = 1
+    
     def __init__(self, delay_between_searches: float = 2.0):
         """
         Initialize Bandcamp crawler.
@@ -23,7 +66,7 @@ class BandcampCrawler(BaseCrawler):
         self.base_url = "https://bandcamp.com"
         
         # Update headers to look more like a real browser
-        self.session.headers.update({
+        self.headers.update({
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate, br',
@@ -36,137 +79,120 @@ class BandcampCrawler(BaseCrawler):
             'Cache-Control': 'max-age=0'
         })
     
-    def clean_query(self, query: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def clean_query(query: str) -> str:
         """Clean query for Bandcamp search."""
         # Bandcamp works well with simple, clean queries
-        cleaned = re.sub(r'[^\w\s\-\(\)\[\]&\.\']', ' ', query)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        
-        # Remove common track indicators that might confuse Bandcamp
-        cleaned = re.sub(r'\s*\([^)]*remix[^)]*\)', '', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'\s*\([^)]*mix[^)]*\)', '', cleaned, flags=re.IGNORECASE)
+        # Also removes common track indicators that might confuse Bandcamp
+        cleaned = _RE_QUERY_JUNK.sub(_replace_query_junk, query)
         
-        return cleaned
+        return cleaned.strip()
     
     def search(self, query: str) -> dict:
         """Search Bandcamp for a track."""
         try:
             clean_query = self.clean_query(query)
             
+            cached = self._get_cached_result(clean_query)
+            if cached is not None:
+                return cached
+            
             # Bandcamp search URL
             search_url = f"https://bandcamp.com/search?q={quote(clean_query)}"
             
-            print(f"  🔍 Bandcamp: {clean_query}")
+            logger.info("  🔍 Bandcamp: %s", clean_query)
             
-            response = self.session.get(search_url, timeout=15)
+            self.wait()
             
-            # Handle specific HTTP errors - return search URL instead of failing
-            if response.status_code == 403:
-                return {
-                    'url': search_url,  # Return the search URL for manual browsing
-                    'confidence': 0.6,  # Medium confidence since it's a search page
-                    'metadata': {
-                        'search_query': clean_query,
-                        'search_url': search_url,
-                        'note': 'Manual search required - Bandcamp blocked automated requests'
-                    },
-                    'error': None
-                }
-            elif response.status_code == 429:
-                return {
-                    'url': search_url,  # Return the search URL for manual browsing
-                    'confidence': 0.6,
-                    'metadata': {
-                        'search_query': clean_query,
-                        'search_url': search_url,
-                        'note': 'Manual search required - Bandcamp rate limited'
-                    },
-                    'error': None
-                }
+            with self.session.get(search_url, headers=self.headers, timeout=15, stream=True) as response:
+                status_code = response.status_code
+                if status_code not in (403, 429):
+                    response.raise_for_status()
+                    # Only the results list is parsed, so stop reading once it has arrived
+                    html_content = self._read_until(response, _has_result_list)
             
-            response.raise_for_status()
+            # Handle specific HTTP errors - return search URL instead of failing
+            if status_code == 403:
+                return self._result(
+                    url=search_url,  # Return the search URL for manual browsing
+                    confidence=0.6,  # Medium confidence since it's a search page
+                    search_query=clean_query,
+                    search_url=search_url,
+                    note='Manual search required - Bandcamp blocked automated requests'
+                )
+            elif status_code == 429:
+                return self._result(
+                    url=search_url,  # Return the search URL for manual browsing
+                    confidence=0.6,
+                    search_query=clean_query,
+                    search_url=search_url,
+                    note='Manual search required - Bandcamp rate limited'
+                )
             
             # Extract results from the search page
-            results = self._extract_search_results(response.text, clean_query)
+            results = self._extract_search_results(html_content, clean_query)
             
             if results:
                 best_match = results[0]  # Take first result
                 
                 # Calculate confidence based on title match
-                confidence = self._calculate_confidence(query, best_match)
+                confidence = self._calculate_confidence(query.lower(), best_match)
                 
-                return {
-                    'url': best_match['url'],
-                    'confidence': confidence,
-                    'metadata': {
-                        'title': best_match.get('title', ''),
-                        'artist': best_match.get('artist', ''),
-                        'album': best_match.get('album', ''),
-                        'search_query': clean_query,
-                        'total_results': len(results)
-                    },
-                    'error': None
-                }
+                result = self._result(
+                    url=best_match['url'],
+                    confidence=confidence,
+                    title=best_match.get('title', ''),
+                    artist=best_match.get('artist', ''),
+                    album=best_match.get('album', ''),
+                    search_query=clean_query,
+                    total_results=len(results)
+                )
+                self._cache_result(clean_query, result)
+                return result
             else:
-                return {
-                    'url': None,
-                    'confidence': 0.0,
-                    'metadata': {'search_query': clean_query},
-                    'error': 'No results found'
-                }
+                return self._result(error='No results found', search_query=clean_query)
                 
         except Exception as e:
-            return {
-                'url': None,
-                'confidence': 0.0,
-                'metadata': {'search_query': query},
-                'error': str(e)
-            }
+            return self._result(error=str(e), search_query=query)
     
     def _extract_search_results(self, html_content: str, query: str) -> list:
         """Extract search results from Bandcamp HTML."""
         results = []
         
-        # Bandcamp search results are in a specific structure
-        # Look for result items in the search page
-        patterns = [
-            # Pattern for track results
-            r'<div[^>]*class="[^"]*result[^"]*"[^>]*>.*?<a[^>]*href="([^"]*)"[^>]*>.*?<div[^>]*class="[^"]*heading[^"]*"[^>]*>([^<]*)</div>.*?<div[^>]*class="[^"]*subhead[^"]*"[^>]*>([^<]*)</div>',
-            # Alternative pattern for album/artist results
-            r'<a[^>]*href="([^"]*)"[^>]*class="[^"]*result[^"]*"[^>]*>.*?<div[^>]*class="[^"]*heading[^"]*"[^>]*>([^<]*)</div>.*?<div[^>]*class="[^"]*subhead[^"]*"[^>]*>([^<]*)</div>'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, html_content, re.DOTALL | re.IGNORECASE)
+        # Everything before the first result item is page chrome
+        for chunk in _RE_RESULT_OPEN.split(html_content)[1:]:
+            href = _RE_HREF.search(chunk)
+            heading = _RE_RESULT_HEADING.search(chunk)
+            subhead = _RE_RESULT_SUBHEAD.search(chunk)
+            if not (href and heading and subhead):
+                continue
             
-            for match in matches:
-                if len(match) >= 3:
-                    url = match[0]
-                    title = match[1].strip()
-                    artist = match[2].strip()
-                    
-                    # Clean up the URL
-                    if url.startswith('/'):
-                        url = f"https://bandcamp.com{url}"
-                    elif not url.startswith('http'):
-                        url = f"https://bandcamp.com/{url}"
-                    
-                    # Skip if it's not a music result
-                    if any(skip in url.lower() for skip in ['/tag/', '/label/', '/fan/']):
-                        continue
-                    
-                    results.append({
-                        'url': url,
-                        'title': title,
-                        'artist': artist,
-                        'album': ''  # Bandcamp doesn't always show album in search
-                    })
-                    
-                    # Limit results
-                    if len(results) >= 5:
-                        break
+            url = href.group(1)
+            title = ' '.join(heading.group(1).split())
+            artist = ' '.join(subhead.group(1).split())
             
-            if results:
+            # Clean up the URL
+            if url.startswith('/'):
+                url = f"https://bandcamp.com{url}"
+            elif not url.startswith('http'):
+                url = f"https://bandcamp.com/{url}"
+            
+            # Skip if it's not a music result
+            if _RE_URL_SKIP.search(url):
+                continue
+            
+            results.append({
+                'url': url,
+                'title': title,
+                'artist': artist,
+                'album': '',  # Bandcamp doesn't always show album in search
+                '_title_lower': title.lower(),
+                '_artist_lower': artist.lower()
+            })
+            
+            # Limit results
+            if len(results) >= 5:
                 break
         
         # If no structured results found, try a simpler approach
@@ -180,30 +206,29 @@ class BandcampCrawler(BaseCrawler):
         results = []
         
         # Look for any Bandcamp links in the search results
-        link_pattern = r'href="(https://[^"]*\.bandcamp\.com/[^"]*)"'
-        title_pattern = r'<[^>]*class="[^"]*heading[^"]*"[^>]*>([^<]+)</[^>]*>'
-        
-        links = re.findall(link_pattern, html_content)
-        titles = re.findall(title_pattern, html_content)
+        links = _RE_BANDCAMP_LINK.findall(html_content)
+        titles = _RE_HEADING.findall(html_content)
         
         # Match links with titles
         for i, link in enumerate(links[:5]):
-            title = titles[i] if i < len(titles) else "Unknown Track"
+            title = titles[i].strip() if i < len(titles) else "Unknown Track"
             
             results.append({
                 'url': link,
-                'title': title.strip(),
+                'title': title,
                 'artist': '',
-                'album': ''
+                'album': '',
+                '_title_lower': title.lower(),
+                '_artist_lower': ''
             })
         
         return results
     
-    def _calculate_confidence(self, original_query: str, result: dict) -> float:
-        """Calculate confidence score for a Bandcamp result."""
-        title = result.get('title', '').lower()
-        artist = result.get('artist', '').lower()
-        query_lower = original_query.lower()
+    def _calculate_confidence(self, query_lower: str, result: dict) -> float:
+        """Calculate confidence score for a Bandcamp result against a lowercased query."""
+        # Results carry lowercase copies of their fields from extraction
+        title = result['_title_lower']
+        artist = result['_artist_lower']
         
         # Check if query matches title or artist
         if query_lower in title or title in query_lower:
@@ -212,15 +237,12 @@ class BandcampCrawler(BaseCrawler):
             return 0.8
         
         # Check word overlap
-        query_words = set(re.findall(r'\w+', query_lower))
-        title_words = set(re.findall(r'\w+', title))
-        artist_words = set(re.findall(r'\w+', artist))
-        
-        all_result_words = title_words.union(artist_words)
+        query_words = set(_RE_WORDS.findall(query_lower))
+        all_result_words = set(_RE_WORDS.findall(f"{title} {artist}"))
         
         if query_words and all_result_words:
-            overlap = len(query_words.intersection(all_result_words))
-            total_words = len(query_words.union(all_result_words))
+            overlap = len(query_words & all_result_words)
+            total_words = len(query_words) + len(all_result_words) - overlap
             return min(0.7, overlap / total_words)
         
         return 0.5  # Default confidence for any result
@@ -5,13 +5,60 @@ Abstract base class for all music platform crawlers.
 """
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+import asyncio
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# One pooled session per platform, shared by every crawler instance for it so
+# connections stay warm even when crawlers are created per tracklist
+_shared_sessions = {}
+_shared_sessions_lock = threading.Lock()
+
+
+def _get_shared_session(name: str) -> requests.Session:
+    """Return the shared session for a platform, creating it on first use."""
+    with _shared_sessions_lock:
+        session = _shared_sessions.get(name)
+        if session is None:
+            session = requests.Session()
+            
+            # Keep connections (and their TLS sessions) alive across searches, with
+            # enough pool slots for concurrent searches and a retry on server errors
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+                max_retries=Retry(
+                    total=2,
+                    backoff_factor=0.3,
+                    status_forcelist=(500, 502, 503, 504),
+                    allowed_methods=frozenset(['GET'])
+                )
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            
+            _shared_sessions[name] = session
+            atexit.register(session.close)
+        return session
 
 
 class BaseCrawler(ABC):
     """Abstract base class for music platform crawlers."""
     
+    # Number of successful search results remembered per crawler
+    RESULT_CACHE_SIZE = 2048
+    
+    # Requests that may go out back to back after an idle spell; beyond that
+    # they are spaced `delay` seconds apart
+    REQUEST_BURST = 3
+    
     def __init__(self, name: str, delay_between_searches: float = 1.0):
         """
         Initialize the crawler.
@@ -22,14 +69,20 @@ class BaseCrawler(ABC):
         """
         self.name = name
         self.delay = delay_between_searches
-        self.session = requests.Session()
+        self._result_cache = OrderedDict()  # casefolded clean query -> result, least recent first
+        self._result_cache_lock = threading.Lock()
+        self._next_request_at = 0.0  # time.monotonic() the request budget is spent up to
+        self._rate_lock = threading.Lock()
         self.setup_session()
     
     def setup_session(self):
-        """Setup the requests session with appropriate headers."""
-        self.session.headers.update({
+        """Attach the platform's shared session and set this crawler's request headers."""
+        self.session = _get_shared_session(self.name)
+        
+        # The session is shared, so headers are kept per crawler and sent per request
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        }
     
     @abstractmethod
     def search(self, query: str) -> dict:
@@ -62,9 +115,115 @@ class BaseCrawler(ABC):
         """
         pass
     
+    @staticmethod
+    def _result(url: str = None, confidence: float = 0.0, error: str = None, **metadata) -> dict:
+        """Build a search result in the shape documented on search()."""
+        return {'url': url, 'confidence': confidence, 'metadata': metadata, 'error': error}
+    
+    @staticmethod
+    def _copy_result(result: dict) -> dict:
+        """Copy a result deeply enough that callers can't change the cached one."""
+        return {**result, 'metadata': dict(result['metadata'])}
+    
+    def _get_cached_result(self, clean_query: str):
+        """Return a copy of an earlier successful result for this query, or None."""
+        # Platform searches ignore case, so tracks that differ only in case share an entry
+        key = clean_query.casefold()
+        with self._result_cache_lock:
+            result = self._result_cache.get(key)
+            if result is None:
+                return None
+            self._result_cache.move_to_end(key)
+        return self._copy_result(result)
+    
+    def _cache_result(self, clean_query: str, result: dict):
+        """Remember a successful result so repeated tracks skip the request."""
+        key = clean_query.casefold()
+        result = self._copy_result(result)
+        with self._result_cache_lock:
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
+    def _read_until(self, response, is_complete, chunk_size: int = 65536) -> str:
+        """
+        Read a streamed response only until the part we parse has arrived.
+        
+        Args:
+            response: Response opened with stream=True
+            is_complete: Called with the bytes read so far; True stops reading
+            chunk_size: Bytes to read per chunk
+            
+        Returns:
+            str: The body read so far, decoded
+        """
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            body += chunk
+            if is_complete(body):
+                break
+        
+        # Closing the response drops whatever is left of the body
+        response.close()
+        return body.decode(response.encoding or 'utf-8', errors='replace')
+    
+    def _reserve_request_slot(self) -> float:
+        """Claim the next request slot and return how long to wait for it."""
+        # A token bucket kept as a single timestamp: each request pushes
+        # _next_request_at one delay further, and a request only waits once
+        # that runs more than REQUEST_BURST - 1 delays ahead of now
+        with self._rate_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_at - (self.REQUEST_BURST - 1) * self.delay)
+            self._next_request_at = max(now, self._next_request_at) + self.delay
+            return start - now
+    
     def wait(self):
-        """Wait between requests to be respectful to the platform."""
-        time.sleep(self.delay)
+        """
+        Wait before a request to be respectful to the platform.
+        
+        Up to REQUEST_BURST requests go out at once after an idle spell;
+        beyond that they are spaced `delay` seconds apart, across all threads
+        using this crawler. Time already spent since the last request counts
+        towards the delay.
+        """
+        residual = self._reserve_request_slot()
+        if residual > 0:
+            time.sleep(residual)
+    
+    def warm_up(self):
+        """
+        Open a pooled connection to the platform ahead of the first search.
+        
+        Resolves DNS and completes the TLS handshake with a HEAD request to
+        the crawler's base_url, so the first search reuses a warm connection.
+        Failures are ignored; the search will simply connect as usual.
+        
+        The HEAD request is a request like any other to the platform, so it
+        takes a rate-limit slot: on crawlers without burst allowance (Bandcamp)
+        the first search then waits out the usual delay after it.
+        """
+        base_url = getattr(self, 'base_url', None)
+        if not base_url:
+            return
+        self.wait()
+        try:
+            self.session.head(base_url, headers=self.headers, timeout=5).close()
+        except requests.RequestException:
+            pass
+    
+    async def search_async(self, query: str) -> dict:
+        """
+        Search for a track from asyncio code without blocking the event loop.
+        
+        Args:
+            query: Search query (usually "Artist - Track")
+        
+        Returns:
+            dict: Same result shape as search()
+        """
+        return await asyncio.to_thread(self.search, query)
     
     def __str__(self):
         """String representation of the crawler."""
@@ -73,3 +232,163 @@ class BaseCrawler(ABC):
     def __repr__(self):
         """Detailed string representation of the crawler."""
         return f"{self.name}Crawler(delay={self.delay})"
+
+
+def _is_confident(future, threshold: float) -> bool:
+    """Whether a finished search future holds a match at or above threshold."""
+    if future.cancelled() or future.exception() is not None:
+        return False
+    result = future.result()
+    return bool(result['url']) and result['confidence'] >= threshold
+
+
+def cancel_when_confident(futures: dict, threshold: float):
+    """
+    Cancel a query's queued platform searches once one of them is confident.
+    
+    Only searches that haven't started yet can be cancelled; running ones
+    finish normally.
+    
+    Args:
+        futures: Mapping of platform name to a future of crawler.search()
+        threshold: Confidence at which the remaining platforms are skipped
+    """
+    def on_done(future):
+        if _is_confident(future, threshold):
+            for other in futures.values():
+                other.cancel()
+    
+    for future in futures.values():
+        future.add_done_callback(on_done)
+
+
+def collect_results(futures: dict, wait: bool = True) -> dict:
+    """
+    Wait for per-platform search futures and gather their results.
+    
+    Results are collected in the futures' order, not completion order, so
+    callers that break ties by order (like best-match selection) are
+    deterministic.
+    
+    Args:
+        futures: Mapping of platform name to a future of crawler.search()
+        wait: False reports searches still running as not awaited instead of
+            waiting for them
+        
+    Returns:
+        dict: Mapping of platform name to that crawler's search result
+    """
+    results = {}
+    for platform_name, future in futures.items():
+        if future.cancelled():
+            results[platform_name] = BaseCrawler._result(error='Skipped - confident match on another platform')
+            continue
+        if not (wait or future.done()):
+            # Still running: its request goes ahead, only this caller stops waiting
+            results[platform_name] = BaseCrawler._result(
+                error='Not awaited - confident match on another platform'
+            )
+            continue
+        try:
+            results[platform_name] = future.result()
+        except Exception as e:
+            # search() reports its own errors; this keeps anything it missed
+            # from discarding the other platforms' results
+            results[platform_name] = BaseCrawler._result(error=str(e))
+    return results
+
+
+def search_all(query: str, crawlers: dict, stop_at: float = None) -> dict:
+    """
+    Search several platforms for the same query concurrently.
+    
+    Each crawler runs on its own thread and waits out its own delay there,
+    so a slow platform never holds up the others.
+    
+    Args:
+        query: Search query (usually "Artist - Track")
+        crawlers: Mapping of platform name to crawler
+        stop_at: Optional confidence at which to return without waiting for
+            the remaining platforms. Their searches still run to completion
+            (using their rate-limit slots) in the background; a success is
+            kept in that crawler's result cache for the next identical query
+        
+    Returns:
+        dict: Mapping of platform name to that crawler's search result
+    """
+    if not crawlers:
+        return {}
+    
+    executor = ThreadPoolExecutor(max_workers=len(crawlers))
+    try:
+        futures = {
+            platform_name: executor.submit(crawler.search, query)
+            for platform_name, crawler in crawlers.items()
+        }
+        if stop_at is None:
+            return collect_results(futures)
+        
+        for future in as_completed(futures.values()):
+            if _is_confident(future, stop_at):
+                break
+        return collect_results(futures, wait=False)
+    finally:
+        # Don't block on searches stop_at stopped waiting for: they keep running
+        # in the background, make their requests, and cache their own successes
+        executor.shutdown(wait=False)
+
+
+async def search_all_async(query: str, crawlers: dict, stop_at: float = None) -> dict:
+    """
+    Asyncio counterpart of search_all(), for callers already on an event loop.
+    
+    Args:
+        query: Search query (usually "Artist - Track")
+        crawlers: Mapping of platform name to crawler
+        stop_at: Optional confidence at which to return without waiting for
+            the remaining platforms, as in search_all()
+        
+    Returns:
+        dict: Mapping of platform name to that crawler's search result
+    """
+    tasks = {
+        platform_name: asyncio.ensure_future(crawler.search_async(query))
+        for platform_name, crawler in crawlers.items()
+    }
+    if not tasks:
+        return {}
+    
+    pending = set(tasks.values())
+    try:
+        if stop_at is None:
+            await asyncio.wait(pending)
+            pending = set()
+        else:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if any(_is_confident(task, stop_at) for task in done):
+                    break
+    finally:
+        # Stop waiting on whatever is left (after stop_at, or if we're cancelled).
+        # The searches run on worker threads, so they still finish in the
+        # background and cache their own successes, as in search_all()
+        for task in pending:
+            task.cancel()
+    
+    results = {}
+    for platform_name, task in tasks.items():
+        if task in pending:
+            results[platform_name] = BaseCrawler._result(
+                error='Not awaited - confident match on another platform'
+            )
+            continue
+        error = task.exception()
+        if error is None:
+            results[platform_name] = task.result()
+        elif isinstance(error, Exception):
+            # As in search_all(), one crawler raising doesn't discard the others' results
+            results[platform_name] = BaseCrawler._result(error=str(error))
+        else:
+            # Cancellation and interpreter exit aren't platform failures
+            raise error
+    return results
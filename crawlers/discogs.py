@@ -4,10 +4,24 @@ Discogs Crawler
 Searches Discogs for music releases using their official API.
 """
 
+import logging
 import re
-import urllib.parse
+from functools import lru_cache
 from .base import BaseCrawler
 
+try:
+    # Optional: orjson parses the API responses several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+# Runs of unwanted characters and whitespace, each collapsed to one space
+_RE_QUERY_JUNK = re.compile(r'[^\w\-\(\)\[\]&\.]+')
+_RE_WORDS = re.compile(r'\w+')
+
 
 class DiscogsCrawler(BaseCrawler):
     """Discogs music crawler using their official API."""
@@ -25,15 +39,16 @@ class DiscogsCrawler(BaseCrawler):
         self.base_url = "https://api.discogs.com"
         
         if self.user_token:
-            self.session.headers.update({
+            self.headers.update({
                 'Authorization': f'Discogs token={self.user_token}'
             })
     
-    def clean_query(self, query: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def clean_query(query: str) -> str:
         """Clean query for Discogs search."""
         # Simple cleaning - just remove problematic characters and normalize spaces
-        clean_query = re.sub(r'[^\w\s\-\(\)\[\]&\.]', ' ', query)
-        clean_query = re.sub(r'\s+', ' ', clean_query).strip()
+        clean_query = _RE_QUERY_JUNK.sub(' ', query).strip()
         return clean_query
     
     def search(self, query: str) -> dict:
@@ -41,50 +56,57 @@ class DiscogsCrawler(BaseCrawler):
         try:
             clean_query = self.clean_query(query)
             
-            # Simple general search parameters
+            cached = self._get_cached_result(clean_query)
+            if cached is not None:
+                return cached
+            
+            # Simple general search parameters - only the first result is used,
+            # and the total comes from the pagination block
             params = {
                 'q': clean_query,
                 'type': 'release',
-                'per_page': 10,
+                'per_page': 1,
             }
             
             search_url = f"{self.base_url}/database/search"
             
-            print(f"  🔍 Discogs: {clean_query}")
+            logger.info("  🔍 Discogs: %s", clean_query)
+            
+            self.wait()
             
-            # Debug: print the actual URL being called
-            full_url = f"{search_url}?{urllib.parse.urlencode(params)}"
-            print(f"    URL: {full_url}")
+            response = self.session.get(search_url, params=params, headers=self.headers, timeout=15)
             
-            response = self.session.get(search_url, params=params, timeout=15)
+            # Debug: log the actual URL that was called, as encoded by requests
+            full_url = response.url
+            logger.debug("Discogs URL: %s", full_url)
             
             # Check response status
             if response.status_code == 401:
-                return {
-                    'url': None,
-                    'confidence': 0.0,
-                    'metadata': {'search_query': clean_query, 'full_url': full_url},
-                    'error': 'Unauthorized - need Discogs token'
-                }
+                return self._result(
+                    error='Unauthorized - need Discogs token',
+                    search_query=clean_query,
+                    full_url=full_url
+                )
             elif response.status_code == 429:
-                return {
-                    'url': None,
-                    'confidence': 0.0,
-                    'metadata': {'search_query': clean_query, 'full_url': full_url},
-                    'error': 'Rate limited - try again later'
-                }
+                return self._result(
+                    error='Rate limited - try again later',
+                    search_query=clean_query,
+                    full_url=full_url
+                )
             
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content) if orjson else response.json()
+            
             results = data.get('results', [])
+            total_results = data.get('pagination', {}).get('items', len(results))
             
-            print(f"    Found {len(results)} results")
+            logger.info("    Found %s results", total_results)
             
             if results:
                 best_match = results[0]  # Take first result
                 
                 # Calculate confidence based on title match
-                confidence = self._calculate_confidence(query, best_match)
+                confidence = self._calculate_confidence(query.lower(), best_match)
                 
                 # Build proper URL
                 discogs_url = best_match.get('uri', '')
@@ -96,52 +118,40 @@ class DiscogsCrawler(BaseCrawler):
                     elif not discogs_url.startswith('http'):
                         discogs_url = f"https://www.discogs.com{discogs_url}"
                 
-                return {
-                    'url': discogs_url,
-                    'confidence': confidence,
-                    'metadata': {
-                        'title': best_match.get('title', ''),
-                        'year': best_match.get('year', ''),
-                        'label': ', '.join(best_match.get('label', [])),
-                        'format': ', '.join(best_match.get('format', [])),
-                        'country': best_match.get('country', ''),
-                        'search_query': clean_query,
-                        'total_results': len(results)
-                    },
-                    'error': None
-                }
+                result = self._result(
+                    url=discogs_url,
+                    confidence=confidence,
+                    title=best_match.get('title', ''),
+                    year=best_match.get('year', ''),
+                    label=', '.join(best_match.get('label', [])),
+                    format=', '.join(best_match.get('format', [])),
+                    country=best_match.get('country', ''),
+                    search_query=clean_query,
+                    total_results=total_results
+                )
+                self._cache_result(clean_query, result)
+                return result
             else:
-                return {
-                    'url': None,
-                    'confidence': 0.0,
-                    'metadata': {'search_query': clean_query},
-                    'error': 'No results found'
-                }
+                return self._result(error='No results found', search_query=clean_query)
                 
         except Exception as e:
-            return {
-                'url': None,
-                'confidence': 0.0,
-                'metadata': {'search_query': query},
-                'error': str(e)
-            }
+            return self._result(error=str(e), search_query=query)
     
-    def _calculate_confidence(self, original_query: str, result: dict) -> float:
-        """Calculate confidence score for a Discogs result."""
+    def _calculate_confidence(self, query_lower: str, result: dict) -> float:
+        """Calculate confidence score for a Discogs result against a lowercased query."""
         title = result.get('title', '').lower()
-        query_lower = original_query.lower()
         
         # Simple confidence calculation based on string similarity
         if query_lower in title or title in query_lower:
             return 0.9
         
         # Check if key words match
-        query_words = set(re.findall(r'\w+', query_lower))
-        title_words = set(re.findall(r'\w+', title))
+        query_words = set(_RE_WORDS.findall(query_lower))
+        title_words = set(_RE_WORDS.findall(title))
         
         if query_words and title_words:
-            overlap = len(query_words.intersection(title_words))
-            total_words = len(query_words.union(title_words))
+            overlap = len(query_words & title_words)
+            total_words = len(query_words) + len(title_words) - overlap
             return min(0.8, overlap / total_words)
         
         return 0.5  # Default confidence for any result
@@ -4,10 +4,63 @@ YouTube Crawler
 Searches YouTube for music tracks using web scraping.
 """
 
+import json
+import logging
 import re
+from functools import lru_cache
 from urllib.parse import quote
 from .base import BaseCrawler
 
+try:
+    # Optional: orjson parses the embedded search results JSON several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+# Runs of unwanted characters and whitespace, each collapsed to one space
+_RE_QUERY_JUNK = re.compile(r'[^\w\-\(\)\[\]&\.\']+')
+
+# Start of the search results JSON embedded in the page
+_RE_INITIAL_DATA = re.compile(r'(?:var\s+ytInitialData|window\["ytInitialData"\])\s*=\s*')
+_JSON_DECODER = json.JSONDecoder()
+
+# Fallback patterns for when the JSON can't be found or its layout changes
+# More precise patterns that target actual search results, tried in order
+# These patterns are more specific to YouTube's current structure
+_VIDEO_ID_PATTERNS = (
+    # Primary video result pattern - targets main search results
+    re.compile(r'"videoRenderer":\s*{[^}]*"videoId":"([a-zA-Z0-9_-]{11})"'),
+    # Compact video result pattern
+    re.compile(r'"compactVideoRenderer":\s*{[^}]*"videoId":"([a-zA-Z0-9_-]{11})"'),
+    # Watch endpoint pattern (more specific)
+    re.compile(r'"watchEndpoint":\s*{\s*"videoId":"([a-zA-Z0-9_-]{11})"'),
+    # Fallback pattern
+    re.compile(r'"videoId":"([a-zA-Z0-9_-]{11})"'),
+)
+
+
+def _has_initial_data(body: bytearray) -> bool:
+    """Whether the whole ytInitialData script has been read."""
+    start = body.find(b'ytInitialData')
+    return start != -1 and body.find(b'</script>', start) != -1
+
+
+def _decode_initial_data(html_content: str, start: int):
+    """Parse the ytInitialData object that begins at index start."""
+    if orjson is not None:
+        # The object is the whole statement, so orjson can parse it as one slice
+        end = html_content.find(';</script>', start)
+        if end != -1:
+            try:
+                return orjson.loads(html_content[start:end])
+            except ValueError:
+                pass
+    # raw_decode stops at the end of the object, ignoring the rest of the script
+    return _JSON_DECODER.raw_decode(html_content, start)[0]
+
 
 class YouTubeCrawler(BaseCrawler):
     """YouTube music crawler using web scraping."""
@@ -15,12 +68,14 @@ class YouTubeCrawler(BaseCrawler):
     def __init__(self, delay_between_searches: float = 1.5):
         """Initialize YouTube crawler with appropriate delay."""
         super().__init__("YouTube", delay_between_searches)
+        self.base_url = "https://www.youtube.com"
     
-    def clean_query(self, query: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def clean_query(query: str) -> str:
         """Clean up the search query for better YouTube results."""
         # Minimal cleaning to preserve original search intent
-        cleaned = re.sub(r'[^\w\s\-\(\)\[\]&\.\']', ' ', query)  # Keep apostrophes
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _RE_QUERY_JUNK.sub(' ', query).strip()  # Keep apostrophes
         
         # Don't automatically add "music" - let YouTube's algorithm decide
         return cleaned
@@ -29,85 +84,89 @@ class YouTubeCrawler(BaseCrawler):
         """Search YouTube for a track and return the best match."""
         try:
             clean_query = self.clean_query(query)
+            
+            cached = self._get_cached_result(clean_query)
+            if cached is not None:
+                return cached
+            
             search_url = f"https://www.youtube.com/results?search_query={quote(clean_query)}"
             
-            print(f"  🔍 YouTube: {clean_query}")
+            logger.info("  🔍 YouTube: %s", clean_query)
+            
+            self.wait()
             
-            response = self.session.get(search_url, timeout=10)
-            response.raise_for_status()
+            # The results JSON comes early in a large page, so stop reading once it has
+            with self.session.get(search_url, headers=self.headers, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                html_content = self._read_until(response, _has_initial_data)
             
-            video_urls = self._extract_video_urls(response.text)
+            video_urls = self._extract_video_urls(html_content)
             
             if video_urls:
                 best_match = video_urls[0]
-                return {
-                    'url': best_match,
-                    'confidence': 0.8,  # Default confidence for first result
-                    'metadata': {
-                        'search_query': clean_query,
-                        'total_results': len(video_urls)
-                    },
-                    'error': None
-                }
+                result = self._result(
+                    url=best_match,
+                    confidence=0.8,  # Default confidence for first result
+                    search_query=clean_query,
+                    total_results=len(video_urls)
+                )
+                self._cache_result(clean_query, result)
+                return result
             else:
-                return {
-                    'url': None,
-                    'confidence': 0.0,
-                    'metadata': {'search_query': clean_query},
-                    'error': 'No results found'
-                }
+                return self._result(error='No results found', search_query=clean_query)
                 
         except Exception as e:
-            return {
-                'url': None,
-                'confidence': 0.0,
-                'metadata': {'search_query': query},
-                'error': str(e)
-            }
+            return self._result(error=str(e), search_query=query)
     
     def _extract_video_urls(self, html_content: str) -> list:
         """Extract YouTube video URLs from search results HTML."""
-        video_urls = []
-        
-        # More precise patterns that target actual search results
-        # These patterns are more specific to YouTube's current structure
-        patterns = [
-            # Primary video result pattern - targets main search results
-            r'"videoRenderer":\s*{[^}]*"videoId":"([a-zA-Z0-9_-]{11})"',
-            # Compact video result pattern
-            r'"compactVideoRenderer":\s*{[^}]*"videoId":"([a-zA-Z0-9_-]{11})"',
-            # Watch endpoint pattern (more specific)
-            r'"watchEndpoint":\s*{\s*"videoId":"([a-zA-Z0-9_-]{11})"',
-            # Fallback pattern
-            r'"videoId":"([a-zA-Z0-9_-]{11})"'
-        ]
+        # Walk the page's own results JSON in one pass when it's there
+        video_ids = self._extract_initial_data_video_ids(html_content)
+        if video_ids:
+            return [f"https://www.youtube.com/watch?v={video_id}" for video_id in video_ids]
         
+        video_urls = []
         found_ids = set()
         
         # Try patterns in order of specificity
-        for pattern in patterns:
-            matches = re.findall(pattern, html_content)
-            
-            for match in matches:
-                if match not in found_ids:
-                    found_ids.add(match)
-                    video_urls.append(f"https://www.youtube.com/watch?v={match}")
+        for pattern in _VIDEO_ID_PATTERNS:
+            # finditer lets us stop scanning the page once we have enough
+            for match in pattern.finditer(html_content):
+                video_id = match.group(1)
+                if video_id not in found_ids:
+                    found_ids.add(video_id)
+                    video_urls.append(f"https://www.youtube.com/watch?v={video_id}")
                     
                     # Get more results for better selection
-                    if len(video_urls) >= 5:
+                    if len(found_ids) >= 5:
                         break
             
             # If we found results with this pattern, use them
             if video_urls:
                 break
         
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_urls = []
-        for url in video_urls:
-            video_id = url.split('v=')[1]
-            if video_id not in seen:
-                seen.add(video_id)
-                unique_urls.append(url)
+        return video_urls  # Top 5 results, already unique
+    
+    def _extract_initial_data_video_ids(self, html_content: str) -> list:
+        """Extract up to 5 video IDs from the ytInitialData search results JSON."""
+        match = _RE_INITIAL_DATA.search(html_content)
+        if not match:
+            return []
+        
+        try:
+            data = _decode_initial_data(html_content, match.end())
+            sections = (data['contents']['twoColumnSearchResultsRenderer']
+                        ['primaryContents']['sectionListRenderer']['contents'])
+        except (ValueError, KeyError, TypeError):
+            return []
+        
+        video_ids = []
+        for section in sections:
+            for item in section.get('itemSectionRenderer', {}).get('contents', []):
+                video_id = item.get('videoRenderer', {}).get('videoId')
+                if video_id and video_id not in video_ids:
+                    video_ids.append(video_id)
+                    if len(video_ids) >= 5:
+                        return video_ids
         
-        return unique_urls[:5]  # Return top 5 results
+        return video_ids
@@ -6,118 +6,94 @@ Generates a beautiful static HTML page from the enhanced tracklist data
 with YouTube embeds and Discogs links.
 """
 
+import gzip
 import json
 import os
+import shutil
 from datetime import datetime
+from functools import lru_cache
 from urllib.parse import urlparse, parse_qs
 
+try:
+    # Optional: ijson streams tracklists out of large JSON files one at a time
+    import ijson
+except ImportError:
+    ijson = None
 
-def extract_youtube_id(url):
-    """Extract YouTube video ID from URL."""
-    if not url:
-        return None
-    
-    parsed = urlparse(url)
-    if parsed.hostname in ['www.youtube.com', 'youtube.com']:
-        return parse_qs(parsed.query).get('v', [None])[0]
-    elif parsed.hostname == 'youtu.be':
-        return parsed.path[1:]
-    return None
+try:
+    # Optional: orjson parses the JSON file several times faster when it is loaded whole
+    import orjson
+except ImportError:
+    orjson = None
 
 
-def generate_tracklist_html(tracklists, output_file="tracklists.html"):
-    """Generate a complete HTML page from tracklist data."""
-    
-    # Count totals for stats
-    total_tracklists = len(tracklists)
-    total_tracks = sum(len(tl.get('tracks', [])) for tl in tracklists)
-    youtube_matches = 0
-    discogs_matches = 0
-    
-    for tracklist in tracklists:
-        for track in tracklist.get('tracks', []):
-            platforms = track.get('platforms', {})
-            if platforms.get('youtube', {}).get('url'):
-                youtube_matches += 1
-            if platforms.get('discogs', {}).get('url'):
-                discogs_matches += 1
-    
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Tracklist Collection</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Public+Sans:ital,wght@0,100..900;1,100..900&display=swap" rel="stylesheet">
-    <style>
-        * {{
+# Page stylesheet - fully static, so it is a plain string rather than part of an f-string
+_CSS = """        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Public Sans', -apple-system, BlinkMacSystemFont, sans-serif;
             line-height: 1.6;
             color: #333;
             background: #ffffff;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             padding: 20px;
-        }}
+        }
         
-        header {{
+        header {
             background: #000000;
             color: white;
             padding: 40px 0;
             text-align: center;
             margin-bottom: 40px;
-        }}
+        }
         
-        header h1 {{
+        header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             font-weight: 300;
             letter-spacing: -0.02em;
-        }}
+        }
         
-        .stats {{
+        .stats {
             display: flex;
             justify-content: center;
             gap: 40px;
             margin-top: 30px;
             flex-wrap: wrap;
-        }}
+        }
         
-        .stat {{
+        .stat {
             text-align: center;
-        }}
+        }
         
-        .stat-number {{
+        .stat-number {
             font-size: 2em;
             font-weight: 600;
             display: block;
-        }}
+        }
         
-        .stat-label {{
+        .stat-label {
             font-size: 0.9em;
             opacity: 0.8;
             font-weight: 400;
-        }}
+        }
         
-        .tracklist {{
+        .tracklist {
             background: white;
             margin-bottom: 2px;
             border: 1px solid #e0e0e0;
             overflow: hidden;
-        }}
+        }
         
-        .tracklist-header {{
+        .tracklist-header {
             background: #f8f8f8;
             color: #333;
             padding: 20px;
@@ -127,78 +103,78 @@ def generate_tracklist_html(tracklists, output_file="tracklists.html"):
             align-items: center;
             border-bottom: 1px solid #e0e0e0;
             gap: 20px;
-        }}
+        }
         
-        .tracklist-header:hover {{
+        .tracklist-header:hover {
             background: #f0f0f0;
-        }}
+        }
         
-        .tracklist-info {{
+        .tracklist-info {
             flex: 1;
             display: flex;
             align-items: center;
             gap: 20px;
-        }}
+        }
         
-        .tracklist-image {{
+        .tracklist-image {
             width: 60px;
             height: 60px;
             object-fit: cover;
             border: 1px solid #ddd;
             flex-shrink: 0;
-        }}
+        }
         
-        .tracklist-text {{
+        .tracklist-text {
             flex: 1;
-        }}
+        }
         
-        .tracklist-title {{
+        .tracklist-title {
             font-size: 1.2em;
             font-weight: 500;
             margin-bottom: 4px;
-        }}
+        }
         
-        .tracklist-subtitle {{
+        .tracklist-subtitle {
             font-size: 0.9em;
             color: #666;
             font-weight: 400;
-        }}
+        }
         
-        .tracklist-controls {{
+        .tracklist-controls {
             display: flex;
             align-items: center;
             gap: 15px;
-        }}
+        }
         
-        .track-count {{
+        .track-count {
             background: #333;
             color: white;
             padding: 4px 8px;
             font-size: 0.85em;
             font-weight: 500;
-        }}
+        }
         
-        .tracks {{
+        .tracks {
             padding: 0;
-        }}
+        }
         
-        .track {{
+        .track {
             border-bottom: 1px solid #f0f0f0;
             padding: 16px 20px;
             display: flex;
             align-items: center;
             gap: 20px;
-        }}
+        }
         
-        .track:last-child {{
+        .track:last-child {
             border-bottom: none;
-        }}
+        }
         
-        .track:hover {{
+        .track:hover {
             background: #fafafa;
-        }}
+        }
         
-        .track-number {{
+        .track-number {
             background: #333;
             color: white;
             width: 24px;
@@ -209,25 +185,25 @@ def generate_tracklist_html(tracklists, output_file="tracklists.html"):
             font-size: 0.8em;
             font-weight: 500;
             flex-shrink: 0;
-        }}
+        }
         
-        .track-info {{
+        .track-info {
             flex: 1;
-        }}
+        }
         
-        .track-name {{
+        .track-name {
             font-weight: 500;
             margin-bottom: 6px;
             color: #333;
-        }}
+        }
         
-        .track-links {{
+        .track-links {
             display: flex;
             gap: 8px;
             flex-wrap: wrap;
-        }}
+        }
         
-        .platform-link {{
+        .platform-link {
             display: inline-flex;
             align-items: center;
             gap: 6px;
@@ -237,111 +213,111 @@ def generate_tracklist_html(tracklists, output_file="tracklists.html"):
             font-weight: 500;
             border: 1px solid;
             transition: all 0.2s ease;
-        }}
+        }
         
-        .youtube-link {{
+        .youtube-link {
             background: #fff;
             color: #ff0000;
             border-color: #ff0000;
-        }}
+        }
         
-        .youtube-link:hover {{
+        .youtube-link:hover {
             background: #ff0000;
             color: white;
-        }}
+        }
         
-        .discogs-link {{
+        .discogs-link {
             background: #fff;
             color: #333;
             border-color: #333;
-        }}
+        }
         
-        .discogs-link:hover {{
+        .discogs-link:hover {
             background: #333;
             color: white;
-        }}
+        }
         
-        .no-results {{
+        .no-results {
             color: #999;
             font-style: italic;
             font-size: 0.9em;
-        }}
+        }
         
-        .confidence {{
+        .confidence {
             font-size: 0.8em;
             color: #666;
             margin-left: 4px;
-        }}
+        }
         
-        .toggle-btn {{
+        .toggle-btn {
             background: none;
             border: none;
             color: #333;
             font-size: 1.2em;
             cursor: pointer;
             font-family: monospace;
-        }}
+        }
         
-        .tracks.collapsed {{
+        .tracks.collapsed {
             display: none;
-        }}
+        }
         
-        footer {{
+        footer {
             text-align: center;
             padding: 40px 0;
             color: #666;
             font-size: 0.9em;
             border-top: 1px solid #e0e0e0;
             margin-top: 40px;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .container {{
+        @media (max-width: 768px) {
+            .container {
                 padding: 10px;
-            }}
+            }
             
-            header h1 {{
+            header h1 {
                 font-size: 2em;
-            }}
+            }
             
-            .stats {{
+            .stats {
                 gap: 20px;
-            }}
+            }
             
-            .tracklist-info {{
+            .tracklist-info {
                 gap: 15px;
-            }}
+            }
             
-            .tracklist-image {{
+            .tracklist-image {
                 width: 50px;
                 height: 50px;
-            }}
+            }
             
-            .tracklist-title {{
+            .tracklist-title {
                 font-size: 1.1em;
-            }}
+            }
             
-            .tracklist-subtitle {{
+            .tracklist-subtitle {
                 font-size: 0.8em;
-            }}
+            }
             
-            .track {{
+            .track {
                 flex-direction: column;
                 align-items: flex-start;
                 gap: 12px;
-            }}
+            }
             
-            .track-links {{
+            .track-links {
                 width: 100%;
-            }}
-        }}
+            }
+        }
         
-        .search-box {{
+        .search-box {
             margin-bottom: 30px;
             text-align: center;
-        }}
+        }
         
-        .search-input {{
+        .search-input {
             padding: 12px 16px;
             font-size: 1em;
             font-family: 'Public Sans', sans-serif;
@@ -350,14 +326,149 @@ def generate_tracklist_html(tracklists, output_file="tracklists.html"):
             max-width: 400px;
             outline: none;
             transition: border-color 0.2s ease;
-        }}
+        }
         
-        .search-input:focus {{
+        .search-input:focus {
             border-color: #333;
-        }}
-    </style>
+        }
+"""
+
+# HTML special characters and their entities, for escaping text and attribute values
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;',
+})
+
+# Tracklist cover image; the intrinsic size lets the browser lay out the header
+# before the image arrives (CSS still sizes it, e.g. smaller on mobile)
+_IMG_TMPL = """
+                        <img src="{url}" alt="{alt}" class="tracklist-image" width="60" height="60" loading="lazy" decoding="async">"""
+
+# Shared read-only default for missing platform data; never mutated
+_EMPTY = {}
+
+_PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Tracklist Collection</title>
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Public+Sans:ital,wght@0,100..900;1,100..900&display=swap" rel="stylesheet">
+    <style>
+""" + _CSS + """    </style>
 </head>
-<body>
+"""
+
+
+class _StreamedTracklists:
+    """
+    Re-iterable view of a JSON array of tracklists, parsed one tracklist at a time.
+    
+    Each iteration re-reads and re-parses the file: generating the page walks
+    it twice (once for the stats, once to write the tracklists), trading that
+    extra parse for never holding the whole array in memory.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+    
+    def __iter__(self):
+        with open(self.path, 'rb', buffering=1 << 20) as f:
+            yield from ijson.items(f, 'item')
+
+
+# URL prefixes whose video ID can be sliced out without parsing the URL
+_YOUTUBE_WATCH_PREFIXES = ('https://www.youtube.com/watch?v=', 'https://youtube.com/watch?v=')
+_YOUTU_BE_PREFIX = 'https://youtu.be/'
+
+
+@lru_cache(maxsize=4096)
+def extract_youtube_id(url):
+    """Extract YouTube video ID from URL."""
+    if not url:
+        return None
+    
+    # Fast path for the plain URLs the crawlers produce; anything that would
+    # need decoding or has a fragment goes through the full parse below
+    if not any(c in url for c in '%+#;'):
+        if url.startswith(_YOUTUBE_WATCH_PREFIXES):
+            video_id = url.partition('v=')[2].partition('&')[0]
+            if video_id:
+                return video_id
+        elif url.startswith(_YOUTU_BE_PREFIX):
+            return url[len(_YOUTU_BE_PREFIX):].partition('?')[0]
+    
+    parsed = urlparse(url)
+    if parsed.hostname in ['www.youtube.com', 'youtube.com']:
+        return parse_qs(parsed.query).get('v', [None])[0]
+    elif parsed.hostname == 'youtu.be':
+        return parsed.path[1:]
+    return None
+
+
+def _iter_track_html(tracks, names, _get=dict.get):
+    """Yield the markup for each track of a tracklist, one string per track.
+    
+    The lowercased track names are appended to names for the search index.
+    """
+    for j, track_data in enumerate(tracks):
+        track_name = _get(track_data, 'track', str(track_data))
+        platforms = _get(track_data, 'platforms') or _EMPTY
+        
+        youtube_data = _get(platforms, 'youtube') or _EMPTY
+        discogs_data = _get(platforms, 'discogs') or _EMPTY
+        
+        youtube_url = _get(youtube_data, 'url')
+        discogs_url = _get(discogs_data, 'url')
+        
+        youtube_confidence = _get(youtube_data, 'confidence', 0)
+        discogs_confidence = _get(discogs_data, 'confidence', 0)
+        
+        safe_name = track_name.translate(_HTML_ESCAPE_TABLE)
+        name_lower = track_name.lower()
+        names.append(name_lower)
+        
+        youtube_link = f"""
+                                <a href="{youtube_url.translate(_HTML_ESCAPE_TABLE)}" target="_blank" class="platform-link youtube-link">
+                                    ▶️ YouTube
+                                    <span class="confidence">({youtube_confidence:.0%})</span>
+                                </a>
+""" if youtube_url else ''
+        
+        discogs_link = f"""
+                                <a href="{discogs_url.translate(_HTML_ESCAPE_TABLE)}" target="_blank" class="platform-link discogs-link">
+                                    💿 Discogs
+                                    <span class="confidence">({discogs_confidence:.0%})</span>
+                                </a>
+""" if discogs_url else ''
+        
+        no_results = '' if youtube_url or discogs_url else """
+                                <span class="no-results">No links found</span>
+"""
+        
+        yield f"""
+                    <div class="track">
+                        <div class="track-number">{j+1}</div>
+                        <div class="track-info">
+                            <div class="track-name">{safe_name}</div>
+                            <div class="track-links">
+{youtube_link}{discogs_link}{no_results}
+                            </div>
+                        </div>
+                    </div>
+"""
+
+
+def _write_page(f, tracklists, tracklist_counts, total_tracklists, total_tracks, youtube_matches, discogs_matches):
+    """Write the page markup fragment by fragment to the text file f."""
+    w = f.write
+    w(_PAGE_HEAD)
+    w(f"""<body>
     <div class="container">
         <header>
             <h1>🎵 Tracklist Collection</h1>
@@ -387,103 +498,64 @@ def generate_tracklist_html(tracklists, output_file="tracklists.html"):
         </div>
         
         <div id="tracklists">
-"""
+""")
 
+    search_index = []  # (lowercased title, lowercased track names) per tracklist
+    
     # Generate each tracklist
-    for i, tracklist in enumerate(tracklists):
+    for i, (tracklist, (track_count, youtube_count, discogs_count)) in enumerate(zip(tracklists, tracklist_counts)):
         title = tracklist.get('title', f'Tracklist {i+1}')
         tracks = tracklist.get('tracks', [])
         image_url = tracklist.get('url', '')
         
+        # Titles and URLs come from scraped data, so escape them before they reach the markup
+        safe_title = title.translate(_HTML_ESCAPE_TABLE)
+        
         # Create a subtitle with track count and platform info
-        youtube_count = sum(1 for track in tracks if track.get('platforms', {}).get('youtube', {}).get('url'))
-        discogs_count = sum(1 for track in tracks if track.get('platforms', {}).get('discogs', {}).get('url'))
-        subtitle = f"{len(tracks)} tracks • {youtube_count} YouTube • {discogs_count} Discogs"
+        subtitle = f"{track_count} tracks • {youtube_count} YouTube • {discogs_count} Discogs"
         
-        html_content += f"""
-            <div class="tracklist" data-title="{title.lower()}">
+        w(f"""
+            <div class="tracklist">
                 <div class="tracklist-header" onclick="toggleTracklist({i})">
-                    <div class="tracklist-info">"""
+                    <div class="tracklist-info">""")
         
         # Add image if available
         if image_url:
-            html_content += f"""
-                        <img src="{image_url}" alt="{title}" class="tracklist-image" loading="lazy">"""
+            w(_IMG_TMPL.format(url=image_url.translate(_HTML_ESCAPE_TABLE), alt=safe_title))
         
-        html_content += f"""
+        w(f"""
                         <div class="tracklist-text">
-                            <div class="tracklist-title">{title}</div>
+                            <div class="tracklist-title">{safe_title}</div>
                             <div class="tracklist-subtitle">{subtitle}</div>
                         </div>
                     </div>
                     <div class="tracklist-controls">
-                        <div class="track-count">{len(tracks)} tracks</div>
+                        <div class="track-count">{track_count} tracks</div>
                         <button class="toggle-btn" id="toggle-{i}">▼</button>
                     </div>
                 </div>
                 <div class="tracks" id="tracks-{i}">
-"""
+""")
         
         # Generate each track
-        for j, track_data in enumerate(tracks):
-            track_name = track_data.get('track', str(track_data))
-            platforms = track_data.get('platforms', {})
-            
-            youtube_data = platforms.get('youtube', {})
-            discogs_data = platforms.get('discogs', {})
-            
-            youtube_url = youtube_data.get('url')
-            discogs_url = discogs_data.get('url')
-            
-            youtube_confidence = youtube_data.get('confidence', 0)
-            discogs_confidence = discogs_data.get('confidence', 0)
-            
-            html_content += f"""
-                    <div class="track" data-track="{track_name.lower()}">
-                        <div class="track-number">{j+1}</div>
-                        <div class="track-info">
-                            <div class="track-name">{track_name}</div>
-                            <div class="track-links">
-"""
-            
-            if youtube_url:
-                html_content += f"""
-                                <a href="{youtube_url}" target="_blank" class="platform-link youtube-link">
-                                    ▶️ YouTube
-                                    <span class="confidence">({youtube_confidence:.0%})</span>
-                                </a>
-"""
-            
-            if discogs_url:
-                html_content += f"""
-                                <a href="{discogs_url}" target="_blank" class="platform-link discogs-link">
-                                    💿 Discogs
-                                    <span class="confidence">({discogs_confidence:.0%})</span>
-                                </a>
-"""
-            
-            if not youtube_url and not discogs_url:
-                html_content += """
-                                <span class="no-results">No links found</span>
-"""
-            
-            html_content += """
-                            </div>
-                        </div>
-                    </div>
-"""
+        names = []
+        f.writelines(_iter_track_html(tracks, names))
+        search_index.append((title.lower(), names))
         
-        html_content += """
+        w("""
                 </div>
             </div>
-"""
+""")
+    
+    # The index is embedded in a script, so '</' must not close it early
+    search_index = json.dumps(search_index, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
     
     # Close HTML and add JavaScript
-    html_content += f"""
+    w(f"""
         </div>
         
         <footer>
-            <p>Generated on {datetime.now().strftime('%Y-%m-%d at %H:%M')}</p>
+            <p>Generated on {datetime.now():%Y-%m-%d at %H:%M}</p>
             <p>🎵 Built with love for music discovery</p>
         </footer>
     </div>
@@ -503,30 +575,85 @@ def generate_tracklist_html(tracklists, output_file="tracklists.html"):
         }}
         
         // Search functionality
+        // INDEX holds the lowercased [title, [track names]] of each tracklist, in page order.
+        // Every trigram maps to the titles and tracks containing it, so a search only
+        // checks the entries of the query's rarest trigram instead of every track.
+        const INDEX = {search_index};
+        const TRIGRAMS = new Map();
+        
+        function addTrigrams(text, i, j) {{
+            const seen = new Set();
+            for (let k = 0; k + 3 <= text.length; k++) {{
+                const gram = text.substr(k, 3);
+                if (seen.has(gram)) continue;
+                seen.add(gram);
+                let entries = TRIGRAMS.get(gram);
+                if (!entries) TRIGRAMS.set(gram, entries = []);
+                entries.push([i, j]);  // j is -1 for the tracklist title
+            }}
+        }}
+        
+        INDEX.forEach(([title, names], i) => {{
+            addTrigrams(title, i, -1);
+            names.forEach((name, j) => addTrigrams(name, i, j));
+        }});
+        
+        // Current visibility, so only elements whose state changes are touched
+        const tracklistShown = INDEX.map(() => true);
+        const trackShown = INDEX.map(([, names]) => names.map(() => true));
+        
+        function findMatches(query) {{
+            // Tracklist index -> {{ title: whether it matches, tracks: matching track indices }}
+            const matches = new Map();
+            const check = (i, j) => {{
+                const text = j < 0 ? INDEX[i][0] : INDEX[i][1][j];
+                if (!text.includes(query)) return;
+                let match = matches.get(i);
+                if (!match) matches.set(i, match = {{ title: false, tracks: new Set() }});
+                if (j < 0) match.title = true;
+                else match.tracks.add(j);
+            }};
+            
+            if (query.length >= 3) {{
+                let candidates = null;
+                for (let k = 0; k + 3 <= query.length; k++) {{
+                    const entries = TRIGRAMS.get(query.substr(k, 3)) || [];
+                    if (!candidates || entries.length < candidates.length) candidates = entries;
+                    if (!candidates.length) break;
+                }}
+                candidates.forEach(([i, j]) => check(i, j));
+            }} else {{
+                INDEX.forEach(([, names], i) => {{
+                    check(i, -1);
+                    names.forEach((_, j) => check(i, j));
+                }});
+            }}
+            return matches;
+        }}
+        
         const searchInput = document.getElementById('searchInput');
         
         searchInput.addEventListener('input', function() {{
             const query = this.value.toLowerCase();
-            const tracklists = document.querySelectorAll('.tracklist');
+            const matches = query ? findMatches(query) : null;
             
-            tracklists.forEach(tracklist => {{
-                const title = tracklist.dataset.title;
-                const tracks = tracklist.querySelectorAll('.track');
-                let hasMatch = title.includes(query);
+            INDEX.forEach(([, names], i) => {{
+                const match = matches && matches.get(i);
+                const tracks = document.getElementById('tracks-' + i);
                 
-                tracks.forEach(track => {{
-                    const trackName = track.dataset.track;
-                    const trackMatch = trackName.includes(query);
-                    
-                    if (trackMatch) {{
-                        hasMatch = true;
-                        track.style.display = 'flex';
-                    }} else {{
-                        track.style.display = query ? 'none' : 'flex';
+                names.forEach((_, j) => {{
+                    const show = !query || (match !== undefined && match.tracks.has(j));
+                    if (show !== trackShown[i][j]) {{
+                        trackShown[i][j] = show;
+                        tracks.children[j].style.display = show ? 'flex' : 'none';
                     }}
                 }});
                 
-                tracklist.style.display = hasMatch || !query ? 'block' : 'none';
+                const show = !query || match !== undefined;
+                if (show !== tracklistShown[i]) {{
+                    tracklistShown[i] = show;
+                    tracks.parentElement.style.display = show ? 'block' : 'none';
+                }}
             }});
         }});
         
@@ -536,19 +663,71 @@ def generate_tracklist_html(tracklists, output_file="tracklists.html"):
         }}
     </script>
 </body>
-</html>"""
+</html>""")
+
+
+def generate_tracklist_html(tracklists, output_file="tracklists.html", gzip_copy=False):
+    """
+    Generate a complete HTML page from tracklist data.
     
-    # Write to file
+    Args:
+        tracklists: List of tracklist dicts, or any iterable that can be
+            iterated twice (stats first, then the page)
+        output_file: Path of the HTML file to write
+        gzip_copy: Also write a pre-compressed output_file + '.gz' for static servers
+        
+    Returns:
+        str: output_file, or None if generation failed
+    """
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Count totals and per-tracklist links for stats in a single pass
+        total_tracklists = 0
+        total_tracks = 0
+        youtube_matches = 0
+        discogs_matches = 0
+        tracklist_counts = []  # (tracks, youtube links, discogs links) per tracklist
+        _get = dict.get
+        
+        for tracklist in tracklists:
+            tracks = tracklist.get('tracks', [])
+            youtube_count = 0
+            discogs_count = 0
+            for track in tracks:
+                platforms = _get(track, 'platforms') or _EMPTY
+                if _get(_get(platforms, 'youtube') or _EMPTY, 'url'):
+                    youtube_count += 1
+                if _get(_get(platforms, 'discogs') or _EMPTY, 'url'):
+                    discogs_count += 1
+            
+            track_count = len(tracks)
+            tracklist_counts.append((track_count, youtube_count, discogs_count))
+            total_tracklists += 1
+            total_tracks += track_count
+            youtube_matches += youtube_count
+            discogs_matches += discogs_count
+        
+        # Stream the page straight into a buffered file instead of building it in memory
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            _write_page(f, tracklists, tracklist_counts,
+                        total_tracklists, total_tracks, youtube_matches, discogs_matches)
+        
+        if gzip_copy:
+            with open(output_file, 'rb') as src, gzip.open(output_file + '.gz', 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+        
+        # One division for both percentages; an empty collection reports 0%
+        inv = (100.0 / total_tracks) if total_tracks else 0.0
+        youtube_pct = youtube_matches * inv
+        discogs_pct = discogs_matches * inv
         
         print(f"✅ HTML page generated: {output_file}")
+        if gzip_copy:
+            print(f"🗜️  Compressed copy: {output_file}.gz")
         print(f"📊 Statistics:")
         print(f"   • {total_tracklists} tracklists")
         print(f"   • {total_tracks} total tracks")
-        print(f"   • {youtube_matches} YouTube links ({youtube_matches/total_tracks*100:.1f}%)")
-        print(f"   • {discogs_matches} Discogs links ({discogs_matches/total_tracks*100:.1f}%)")
+        print(f"   • {youtube_matches} YouTube links ({youtube_pct:.1f}%)")
+        print(f"   • {discogs_matches} Discogs links ({discogs_pct:.1f}%)")
         print(f"\n🌐 Open {output_file} in your browser to view!")
         
         return output_file
@@ -570,9 +749,23 @@ def main():
     
     for filename in input_files:
         if os.path.exists(filename):
+            if ijson:
+                # Stream tracklists from the file instead of loading it all at once.
+                # Parsing the first one up front still falls back to the next file
+                # when this one is malformed, and catches an empty array.
+                streamed = _StreamedTracklists(filename)
+                try:
+                    first = next(iter(streamed), None)
+                except Exception as e:
+                    print(f"⚠️  Could not read {filename}: {e}")
+                    continue
+                data = streamed if first is not None else []
+                used_file = filename
+                break
             try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(filename, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if orjson else json.loads(raw)
                 used_file = filename
                 break
             except Exception as e:
@@ -585,8 +778,8 @@ def main():
     
     print(f"📂 Using data from: {used_file}")
     
-    # Generate HTML
-    output_file = generate_tracklist_html(data)
+    # Generate HTML, plus a gzipped copy when HTML_GZIP=1
+    output_file = generate_tracklist_html(data, gzip_copy=os.environ.get('HTML_GZIP') == '1')
     
     if output_file:
         # Get absolute path for easier opening
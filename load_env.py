@@ -15,28 +15,29 @@ def load_env(env_file=".env"):
         return False
     
     try:
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                
-                # Skip empty lines and comments
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Parse KEY=VALUE format
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    # Remove quotes if present
-                    if value.startswith('"') and value.endswith('"'):
-                        value = value[1:-1]
-                    elif value.startswith("'") and value.endswith("'"):
-                        value = value[1:-1]
-                    
-                    # Set environment variable
-                    os.environ[key] = value
+        # Read the whole file at once and set everything in a single update
+        with open(env_file, 'r', encoding='utf-8') as f:
+            data = f.read()
+        
+        env = {}
+        for line in data.splitlines():
+            line = line.strip()
+            
+            # Skip empty lines, comments and anything not in KEY=VALUE format
+            if not line or line[0] == '#' or '=' not in line:
+                continue
+            
+            key, _, value = line.partition('=')
+            value = value.strip()
+            
+            # Remove quotes if present
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+                value = value[1:-1]
+            
+            env[key.strip()] = value
+        
+        # Set environment variables
+        os.environ.update(env)
         
         return True
     
@@ -17,12 +17,14 @@ class Tracklist(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(200), nullable=False)
     extracted_text = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    search_status = db.Column(db.String(20), default='pending')  # pending, processing, completed, failed
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    search_status = db.Column(db.String(20), default='pending', index=True)  # pending, processing, completed, failed
     search_progress = db.Column(db.Integer, default=0)  # 0-100 percentage
     
-    # Relationships
-    tracks = db.relationship('Track', backref='tracklist', lazy=True, cascade='all, delete-orphan')
+    # Relationships - tracks come in with one SELECT ... IN per batch of tracklists,
+    # in id (= tracklist) order
+    tracks = db.relationship('Track', back_populates='tracklist', lazy='selectin',
+                             cascade='all, delete-orphan', order_by='Track.id')
     
     def __repr__(self):
         return f'<Tracklist {self.id}: {self.title}>'
@@ -43,6 +45,11 @@ class Tracklist(db.Model):
 class Track(db.Model):
     """Track model - represents individual tracks within a tracklist."""
     
+    # SQLite doesn't index foreign keys by itself; this covers loading a
+    # tracklist's tracks, optionally ordered by name, so tracklist_id needs
+    # no index of its own
+    __table_args__ = (db.Index('ix_track_tl_name', 'tracklist_id', 'track_name'),)
+    
     id = db.Column(db.Integer, primary_key=True)
     track_name = db.Column(db.String(300), nullable=False)
     tracklist_id = db.Column(db.String(36), db.ForeignKey('tracklist.id'), nullable=False)
@@ -58,6 +65,9 @@ class Track(db.Model):
     # Metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Relationships
+    tracklist = db.relationship('Tracklist', back_populates='tracks')
+    
     def __repr__(self):
         return f'<Track {self.id}: {self.track_name}>'
     
@@ -7,12 +7,73 @@ Provides a unified interface for searching multiple music platforms
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import logging
+import os
+import shelve
+import threading
 import time
 import re
 import requests
-from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import quote, urlencode
 import json
 
+try:
+    # Optional: orjson parses the embedded search results and API JSON several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+# Query cleanup: unwanted characters, and runs of whitespace
+_RE_YOUTUBE_QUERY_JUNK = re.compile(r'[^\w\s\-\(\)\[\]&\.\']')
+_RE_DISCOGS_QUERY_JUNK = re.compile(r'[^\w\s\-\(\)\[\]&\.]')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_WORDS = re.compile(r'\w+')
+
+# Start of the search results JSON embedded in the page
+_RE_INITIAL_DATA = re.compile(r'(?:var\s+ytInitialData|window\["ytInitialData"\])\s*=\s*')
+_JSON_DECODER = json.JSONDecoder()
+
+# Fallback patterns for when the JSON can't be found or its layout changes
+# More precise patterns that target actual search results, tried in order
+# These patterns are more specific to YouTube's current structure
+_VIDEO_ID_PATTERNS = (
+    # Primary video result pattern - targets main search results
+    re.compile(r'"videoRenderer":\s*{[^}]*"videoId":"([a-zA-Z0-9_-]{11})"'),
+    # Compact video result pattern
+    re.compile(r'"compactVideoRenderer":\s*{[^}]*"videoId":"([a-zA-Z0-9_-]{11})"'),
+    # Watch endpoint pattern (more specific)
+    re.compile(r'"watchEndpoint":\s*{\s*"videoId":"([a-zA-Z0-9_-]{11})"'),
+    # Fallback pattern
+    re.compile(r'"videoId":"([a-zA-Z0-9_-]{11})"'),
+)
+
+
+def _has_initial_data(body: bytearray) -> bool:
+    """Whether the whole ytInitialData script has been read."""
+    start = body.find(b'ytInitialData')
+    return start != -1 and body.find(b'</script>', start) != -1
+
+
+def _decode_initial_data(html_content: str, start: int):
+    """Parse the ytInitialData object that begins at index start."""
+    if orjson is not None:
+        # The object is the whole statement, so orjson can parse it as one slice
+        end = html_content.find(';</script>', start)
+        if end != -1:
+            try:
+                return orjson.loads(html_content[start:end])
+            except ValueError:
+                pass
+    # raw_decode stops at the end of the object, ignoring the rest of the script
+    return _JSON_DECODER.raw_decode(html_content, start)[0]
+
 
 class MusicSearcher(ABC):
     """Abstract base class for music platform searchers."""
@@ -20,11 +81,28 @@ class MusicSearcher(ABC):
     def __init__(self, name: str, delay_between_searches: float = 1.0):
         self.name = name
         self.delay = delay_between_searches
+        self._next_request_at = 0.0  # time.monotonic() before which the next request waits
+        self._rate_lock = threading.Lock()
         self.session = requests.Session()
         self.setup_session()
     
     def setup_session(self):
-        """Setup the requests session with appropriate headers."""
+        """Setup the requests session with connection pooling and appropriate headers."""
+        # Keep connections (and their TLS sessions) alive across searches, with
+        # enough pool slots for concurrent searches and a retry on server errors
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=(500, 502, 503, 504),
+                allowed_methods=frozenset(['GET'])
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
@@ -49,9 +127,41 @@ class MusicSearcher(ABC):
         """Clean and optimize query for this platform."""
         pass
     
+    def _read_until(self, response, is_complete, chunk_size: int = 65536) -> str:
+        """
+        Read a streamed response only until the part we parse has arrived.
+        
+        Args:
+            response: Response opened with stream=True
+            is_complete: Called with the bytes read so far; True stops reading
+            chunk_size: Bytes to read per chunk
+            
+        Returns:
+            str: The body read so far, decoded
+        """
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            body += chunk
+            if is_complete(body):
+                break
+        
+        # Closing the response drops whatever is left of the body
+        response.close()
+        return body.decode(response.encoding or 'utf-8', errors='replace')
+    
     def wait(self):
-        """Wait between requests to be respectful."""
-        time.sleep(self.delay)
+        """
+        Wait before a request to be respectful.
+        
+        Requests to this platform are spaced at least `delay` seconds apart,
+        across all threads, counting time already spent since the last one.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_at)
+            self._next_request_at = start + self.delay
+        if start > now:
+            time.sleep(start - now)
 
 
 class YouTubeSearcher(MusicSearcher):
@@ -60,11 +170,13 @@ class YouTubeSearcher(MusicSearcher):
     def __init__(self, delay_between_searches: float = 1.5):
         super().__init__("YouTube", delay_between_searches)
     
-    def clean_query(self, query: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def clean_query(query: str) -> str:
         """Clean up the search query for better YouTube results."""
         # Minimal cleaning to preserve original search intent
-        cleaned = re.sub(r'[^\w\s\-\(\)\[\]&\.\']', ' ', query)  # Keep apostrophes
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _RE_YOUTUBE_QUERY_JUNK.sub(' ', query)  # Keep apostrophes
+        cleaned = _RE_WHITESPACE.sub(' ', cleaned).strip()
         
         # Don't automatically add "music" - let YouTube's algorithm decide
         return cleaned
@@ -75,12 +187,16 @@ class YouTubeSearcher(MusicSearcher):
             clean_query = self.clean_query(query)
             search_url = f"https://www.youtube.com/results?search_query={quote(clean_query)}"
             
-            print(f"  🔍 YouTube: {clean_query}")
+            logger.info("  🔍 YouTube: %s", clean_query)
             
-            response = self.session.get(search_url, timeout=10)
-            response.raise_for_status()
+            self.wait()
+            
+            # The results JSON comes early in a large page, so stop reading once it has
+            with self.session.get(search_url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                html_content = self._read_until(response, _has_initial_data)
             
-            video_urls = self._extract_video_urls(response.text)
+            video_urls = self._extract_video_urls(html_content)
             
             if video_urls:
                 best_match = video_urls[0]
@@ -111,31 +227,22 @@ class YouTubeSearcher(MusicSearcher):
     
     def _extract_video_urls(self, html_content: str) -> list:
         """Extract YouTube video URLs from search results HTML."""
-        video_urls = []
-        
-        # More precise patterns that target actual search results
-        # These patterns are more specific to YouTube's current structure
-        patterns = [
-            # Primary video result pattern - targets main search results
-            r'"videoRenderer":\s*{[^}]*"videoId":"([a-zA-Z0-9_-]{11})"',
-            # Compact video result pattern
-            r'"compactVideoRenderer":\s*{[^}]*"videoId":"([a-zA-Z0-9_-]{11})"',
-            # Watch endpoint pattern (more specific)
-            r'"watchEndpoint":\s*{\s*"videoId":"([a-zA-Z0-9_-]{11})"',
-            # Fallback pattern
-            r'"videoId":"([a-zA-Z0-9_-]{11})"'
-        ]
+        # Walk the page's own results JSON in one pass when it's there
+        video_ids = self._extract_initial_data_video_ids(html_content)
+        if video_ids:
+            return [f"https://www.youtube.com/watch?v={video_id}" for video_id in video_ids]
         
+        video_urls = []
         found_ids = set()
         
         # Try patterns in order of specificity
-        for pattern in patterns:
-            matches = re.findall(pattern, html_content)
-            
-            for match in matches:
-                if match not in found_ids:
-                    found_ids.add(match)
-                    video_urls.append(f"https://www.youtube.com/watch?v={match}")
+        for pattern in _VIDEO_ID_PATTERNS:
+            # finditer lets us stop scanning the page once we have enough
+            for match in pattern.finditer(html_content):
+                video_id = match.group(1)
+                if video_id not in found_ids:
+                    found_ids.add(video_id)
+                    video_urls.append(f"https://www.youtube.com/watch?v={video_id}")
                     
                     # Get more results for better selection
                     if len(video_urls) >= 5:
@@ -143,18 +250,33 @@ class YouTubeSearcher(MusicSearcher):
             
             # If we found results with this pattern, use them
             if video_urls:
-                break
+                return video_urls  # Top 5 results, already unique
         
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_urls = []
-        for url in video_urls:
-            video_id = url.split('v=')[1]
-            if video_id not in seen:
-                seen.add(video_id)
-                unique_urls.append(url)
+        return video_urls
+    
+    def _extract_initial_data_video_ids(self, html_content: str) -> list:
+        """Extract up to 5 video IDs from the ytInitialData search results JSON."""
+        match = _RE_INITIAL_DATA.search(html_content)
+        if not match:
+            return []
         
-        return unique_urls[:5]  # Return top 5 results
+        try:
+            data = _decode_initial_data(html_content, match.end())
+            sections = (data['contents']['twoColumnSearchResultsRenderer']
+                        ['primaryContents']['sectionListRenderer']['contents'])
+        except (ValueError, KeyError, TypeError):
+            return []
+        
+        video_ids = []
+        for section in sections:
+            for item in section.get('itemSectionRenderer', {}).get('contents', []):
+                video_id = item.get('videoRenderer', {}).get('videoId')
+                if video_id and video_id not in video_ids:
+                    video_ids.append(video_id)
+                    if len(video_ids) >= 5:
+                        return video_ids
+        
+        return video_ids
 
 
 class DiscogsSearcher(MusicSearcher):
@@ -170,11 +292,13 @@ class DiscogsSearcher(MusicSearcher):
                 'Authorization': f'Discogs token={self.user_token}'
             })
     
-    def clean_query(self, query: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def clean_query(query: str) -> str:
         """Clean query for Discogs search."""
         # Simple cleaning - just remove problematic characters and normalize spaces
-        clean_query = re.sub(r'[^\w\s\-\(\)\[\]&\.]', ' ', query)
-        clean_query = re.sub(r'\s+', ' ', clean_query).strip()
+        clean_query = _RE_DISCOGS_QUERY_JUNK.sub(' ', query)
+        clean_query = _RE_WHITESPACE.sub(' ', clean_query).strip()
         return clean_query
     
     def search(self, query: str) -> dict:
@@ -191,13 +315,13 @@ class DiscogsSearcher(MusicSearcher):
             
             search_url = f"{self.base_url}/database/search"
             
-            print(f"  🔍 Discogs: {clean_query}")
+            logger.info("  🔍 Discogs: %s", clean_query)
             
-            # Debug: print the actual URL being called
-            import urllib.parse
-            full_url = f"{search_url}?{urllib.parse.urlencode(params)}"
-            print(f"    URL: {full_url}")
+            # Debug: log the actual URL being called
+            full_url = f"{search_url}?{urlencode(params)}"
+            logger.debug("Discogs URL: %s", full_url)
             
+            self.wait()
             response = self.session.get(search_url, params=params, timeout=15)
             
             # Check response status
@@ -217,16 +341,21 @@ class DiscogsSearcher(MusicSearcher):
                 }
             
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content) if orjson else response.json()
             results = data.get('results', [])
             
-            print(f"    Found {len(results)} results")
+            logger.info("    Found %s results", len(results))
             
             if results:
-                best_match = results[0]  # Take first result
-                
-                # Calculate confidence based on title match
-                confidence = self._calculate_confidence(query, best_match)
+                # Rank every returned release by title match; the query is only
+                # tokenized once, and ties keep the API's order
+                query_lower = query.lower()
+                query_words = frozenset(_RE_WORDS.findall(query_lower))
+                scored = [
+                    (self._calculate_confidence(query_lower, query_words, result), result)
+                    for result in results
+                ]
+                confidence, best_match = max(scored, key=lambda item: item[0])
                 
                 # Build proper URL
                 discogs_url = best_match.get('uri', '')
@@ -270,36 +399,79 @@ class DiscogsSearcher(MusicSearcher):
     
 
     
-    def _calculate_confidence(self, original_query: str, result: dict) -> float:
-        """Calculate confidence score for a Discogs result."""
+    def _calculate_confidence(self, query_lower: str, query_words: frozenset, result: dict) -> float:
+        """Calculate confidence score for a Discogs result against a lowercased, tokenized query."""
         title = result.get('title', '').lower()
-        query_lower = original_query.lower()
         
         # Simple confidence calculation based on string similarity
         if query_lower in title or title in query_lower:
             return 0.9
         
         # Check if key words match
-        query_words = set(re.findall(r'\w+', query_lower))
-        title_words = set(re.findall(r'\w+', title))
+        title_words = frozenset(_RE_WORDS.findall(title))
         
         if query_words and title_words:
-            overlap = len(query_words.intersection(title_words))
-            total_words = len(query_words.union(title_words))
+            overlap = len(query_words & title_words)
+            total_words = len(query_words | title_words)
             return min(0.8, overlap / total_words)
         
         return 0.5  # Default confidence for any result
 
 
+# Default on-disk search result cache, kept in the user's cache directory
+# rather than wherever the script happens to be run from
+DEFAULT_CACHE_FILE = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'tracklist-scraper',
+    'search_cache'
+)
+
+
 class TrackSearchManager:
-    """Manages searching across multiple music platforms."""
+    """
+    Manages searching across multiple music platforms.
+    
+    Call close() when done, or use the manager as a context manager, so the
+    on-disk cache is written out and closed.
+    """
     
-    def __init__(self, discogs_token: str = None):
+    # How long a cached search result stays valid, in seconds
+    CACHE_TTL = 30 * 24 * 3600
+    
+    def __init__(self, discogs_token: str = None, cache_file: str = DEFAULT_CACHE_FILE):
+        """
+        Initialize the search manager.
+        
+        Args:
+            discogs_token: Optional Discogs API token
+            cache_file: Path of the on-disk search result cache, or None to disable it
+        """
         self.searchers = {
             'youtube': YouTubeSearcher(delay_between_searches=1.5),
             'discogs': DiscogsSearcher(delay_between_searches=1.0, user_token=discogs_token)
         }
         self.enabled_platforms = set(self.searchers.keys())
+        
+        # Results survive between runs, so re-running a search or meeting the
+        # same track in another tracklist doesn't hit the platforms again
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        if cache_file:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+            self._cache = shelve.open(cache_file)
+    
+    def close(self):
+        """Write out and close the on-disk search result cache."""
+        with self._cache_lock:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def enable_platform(self, platform: str):
         """Enable a specific platform for searching."""
@@ -310,25 +482,50 @@ class TrackSearchManager:
         """Disable a specific platform for searching."""
         self.enabled_platforms.discard(platform)
     
+    def _cache_key(self, track: str, platforms) -> str:
+        """Cache key for a track searched on the given platforms."""
+        normalized = ' '.join(track.lower().split())
+        return f"{','.join(sorted(platforms))}|{normalized}"
+    
     def search_track(self, track: str) -> dict:
         """Search for a track across all enabled platforms."""
+        # Walking the searchers dict (not the set) keeps platform order stable
+        searchers = {
+            platform_name: searcher
+            for platform_name, searcher in self.searchers.items()
+            if platform_name in self.enabled_platforms
+        }
         results = {}
         
-        for platform_name in self.enabled_platforms:
-            if platform_name in self.searchers:
-                searcher = self.searchers[platform_name]
-                result = searcher.search(track)
-                results[platform_name] = result
-                
-                # Wait between different platform searches
-                if platform_name != list(self.enabled_platforms)[-1]:  # Don't wait after last platform
-                    searcher.wait()
+        key = self._cache_key(track, searchers)
+        with self._cache_lock:
+            cached = self._cache.get(key) if self._cache is not None else None
+        if cached and time.time() - cached[0] < self.CACHE_TTL:
+            return {**cached[1], 'track': track}
         
-        return {
+        # Each platform is a different host, so search them all at once; every
+        # searcher spaces out its own requests in search()
+        if searchers:
+            with ThreadPoolExecutor(max_workers=len(searchers)) as executor:
+                futures = {
+                    platform_name: executor.submit(searcher.search, track)
+                    for platform_name, searcher in searchers.items()
+                }
+                results = {platform_name: future.result() for platform_name, future in futures.items()}
+        
+        result = {
             'track': track,
             'platforms': results,
             'best_match': self._find_best_match(results)
         }
+        
+        # Only remember complete answers, so failed searches are retried next time
+        if not any(r['error'] for r in results.values()):
+            with self._cache_lock:
+                if self._cache is not None:
+                    self._cache[key] = (time.time(), result)
+        
+        return result
     
     def _find_best_match(self, platform_results: dict) -> dict:
         """Find the platform result with the highest confidence."""
@@ -348,9 +545,9 @@ class TrackSearchManager:
 
 if __name__ == "__main__":
     # Example usage
-    manager = TrackSearchManager()
-    
-    test_track = "Deadbeat - The Double Bong Cloud (Denial !)"
-    result = manager.search_track(test_track)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    with TrackSearchManager() as manager:
+        test_track = "Deadbeat - The Double Bong Cloud (Denial !)"
+        result = manager.search_track(test_track)
     
     print(json.dumps(result, indent=2))
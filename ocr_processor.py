@@ -9,17 +9,196 @@ import pytesseract
 from PIL import Image
 import re
 import json
+import asyncio
+import logging
+import queue
 import requests
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 import os
 
+try:
+    # Optional: tesserocr keeps the tesseract engine (and its language model)
+    # loaded between images instead of starting a tesseract process per call
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+try:
+    # Optional: orjson reads and writes the tracklist JSON files several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: RE2 matches in linear time, so degenerate OCR lines can't
+    # make the lazy track pattern backtrack
+    import re2
+except ImportError:
+    re2 = None
+
+logger = logging.getLogger(__name__)
+
+
+# Track line parsing patterns, compiled once at import
+if re2 is not None:
+    # RE2's \s is ASCII-only, so spell out the Unicode whitespace Python's \s matches
+    _RE_TRACK = re2.compile(
+        r'^(.+?)[\s\v\x1c-\x1f\x85\p{Z}]*[-–—~|/:=\\][\s\v\x1c-\x1f\x85\p{Z}]*(.+)$'
+    )
+else:
+    _RE_TRACK = re.compile(r'^(.+?)\s*[-–—~|/:=\\]\s*(.+)$')
+# Tesseract rescales text lines internally, so larger images only add OCR work
+MAX_OCR_DIMENSION = 2000
+
+# Tracklists are a single block of text lines; LSTM-only skips the legacy engine
+TESSERACT_OEM = 1  # OEM.LSTM_ONLY
+TESSERACT_PSM = 6  # PSM.SINGLE_BLOCK
+TESSERACT_CONFIG = f'--oem {TESSERACT_OEM} --psm {TESSERACT_PSM}'
+
+_TRACK_SEPARATORS = frozenset('-–—~|/:=\\')
+_RE_LEADING_NUMBER = re.compile(r'^\d+\.?\s*')
+_JUNK_CHARS = '*#@$%^&_+=|\\<>'
+
+
+
+def _parse_track_line(line: str, _separators=_TRACK_SEPARATORS, _match=_RE_TRACK.match,
+                      _strip_number=_RE_LEADING_NUMBER.sub, _junk=_JUNK_CHARS) -> Optional[str]:
+    """Parse one OCR text line into "Artist - Track", or None if it isn't a track."""
+    line = line.strip()
+    
+    # Lines without any separator character (empty ones included) can never match
+    if _separators.isdisjoint(line):
+        return None
+    
+    # Try to match track pattern
+    match = _match(line)
+    if not match:
+        return None
+    
+    part1, part2 = match.groups()
+    
+    # Clean up the parts - remove track numbers and special characters
+    part1 = _strip_number('', part1).strip(_junk).strip()
+    part2 = part2.strip(_junk).strip()
+    
+    if part1 and part2:
+        return f"{part1} - {part2}"
+    return None
+
 
 class OCRProcessor:
-    """Handles OCR processing of tracklist images."""
+    """
+    Handles OCR processing of tracklist images.
+    
+    Call close() when done, or use the processor as a context manager, so its
+    tesserocr engines and download session are released.
+    """
+    
+    def __init__(self, max_workers: int = 8):
+        """
+        Initialize the OCR processor.
+        
+        Args:
+            max_workers: Number of images downloaded concurrently when
+                processing an Are.na channel (OCR is also capped by CPU count)
+        """
+        self.max_workers = max_workers
+        self._tess_idle = queue.LifoQueue()  # tesserocr API handles not in use
+        self._tess_apis = []  # every handle created, so close() can end them
+        self._tess_lock = threading.Lock()
+        self._channel_cache = {}  # channel URL -> (ETag, channel data)
+        self.session = requests.Session()
+        self.setup_session()
+    
+    def close(self):
+        """End the tesserocr engines and close the download session."""
+        with self._tess_lock:
+            apis, self._tess_apis = self._tess_apis, []
+        while True:
+            try:
+                self._tess_idle.get_nowait()
+            except queue.Empty:
+                break
+        for api in apis:
+            api.End()
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def setup_session(self):
+        """Setup a pooled requests session shared by all download threads."""
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self.max_workers,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    @contextmanager
+    def _tess_api(self):
+        """
+        Borrow an idle tesserocr API handle, creating one only if all are busy.
+        
+        Handles belong to the processor rather than to a thread, so short-lived
+        pool and request threads reuse the same few loaded engines.
+        """
+        try:
+            api = self._tess_idle.get_nowait()
+        except queue.Empty:
+            # Engine mode and page segmentation are fixed once per handle, not per image
+            api = tesserocr.PyTessBaseAPI(psm=TESSERACT_PSM, oem=TESSERACT_OEM)
+            with self._tess_lock:
+                self._tess_apis.append(api)
+        try:
+            yield api
+        finally:
+            self._tess_idle.put(api)
+    
+    def _prepare_image(self, image: Image.Image) -> Image.Image:
+        """Reduce an image to the single grayscale channel tesseract binarizes from."""
+        if max(image.size) > MAX_OCR_DIMENSION:
+            # Lets JPEGs decode straight to a reduced scale; a no-op for other formats
+            image.draft('L', (MAX_OCR_DIMENSION, MAX_OCR_DIMENSION))
+        
+        if image.mode == 'P' and 'transparency' in image.info:
+            image = image.convert('RGBA')
+        
+        if 'A' in image.getbands():
+            # Flatten transparency onto white, as pytesseract would
+            background = Image.new('L', image.size, 255)
+            background.paste(image.convert('L'), (0, 0), image.getchannel('A'))
+            image = background
+        elif image.mode != 'L':
+            image = image.convert('L')
+        
+        if max(image.size) > MAX_OCR_DIMENSION:
+            image.thumbnail((MAX_OCR_DIMENSION, MAX_OCR_DIMENSION), Image.LANCZOS)
+        
+        return image
     
-    def __init__(self):
-        """Initialize the OCR processor."""
-        self.track_pattern = r'^(.+?)\s*[-–—~|/:=\\]\s*(.+)$'
+    def _extract_text(self, image: Image.Image) -> str:
+        """Run OCR on an opened image and return the raw text."""
+        return self._recognize(self._prepare_image(image))
+    
+    def _recognize(self, image: Image.Image) -> str:
+        """Run OCR on an image already reduced by _prepare_image."""
+        if tesserocr is not None:
+            with self._tess_api() as api:
+                api.SetImage(image)
+                return api.GetUTF8Text()
+        
+        return pytesseract.image_to_string(image, config=TESSERACT_CONFIG)
     
     def process_image(self, image_path: str) -> str:
         """
@@ -35,14 +214,23 @@ class OCRProcessor:
             # Open and process the image
             image = Image.open(image_path)
             
-            # Use pytesseract to extract text
-            text = pytesseract.image_to_string(image)
+            # Use tesseract to extract text
+            text = self._extract_text(image)
             
             return text.strip()
             
         except Exception as e:
             raise Exception(f"Error processing image {image_path}: {str(e)}")
     
+    def _download_image(self, image_url: str) -> Image.Image:
+        """Download and decode an image, reduced and ready for _recognize."""
+        response = self.session.get(image_url, timeout=30)
+        response.raise_for_status()
+        
+        image = Image.open(BytesIO(response.content))
+        
+        return self._prepare_image(image)
+    
     def parse_tracks_from_text(self, text: str) -> List[str]:
         """
         Parse track information from extracted text.
@@ -53,29 +241,7 @@ class OCRProcessor:
         Returns:
             List of parsed track strings
         """
-        tracks = []
-        lines = text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Try to match track pattern
-            match = re.match(self.track_pattern, line)
-            if match:
-                part1, part2 = match.groups()
-                
-                # Clean up the parts - remove track numbers and special characters
-                part1 = re.sub(r'^\d+\.?\s*', '', part1)  # Remove leading numbers
-                part1 = re.sub(r'^[*#@$%^&_+=|\\<>]*|[*#@$%^&_+=|\\<>]*$', '', part1).strip()
-                part2 = re.sub(r'^[*#@$%^&_+=|\\<>]*|[*#@$%^&_+=|\\<>]*$', '', part2).strip()
-                
-                if part1 and part2:
-                    track = f"{part1} - {part2}"
-                    tracks.append(track)
-        
-        return tracks
+        return [track for track in map(_parse_track_line, text.split('\n')) if track]
     
     def process_tracklist_image(self, image_path: str, title: str = None) -> Dict:
         """
@@ -120,36 +286,90 @@ class OCRProcessor:
             List of tracklist data dictionaries
         """
         try:
-            # Fetch channel data from Are.na
+            # Fetch channel data from Are.na, revalidating any earlier copy
             url = f"https://api.are.na/v2/channels/{channel_slug}"
-            response = requests.get(url)
-            response.raise_for_status()
+            cached = self._channel_cache.get(url)
+            headers = {'If-None-Match': cached[0]} if cached else None
+            response = self.session.get(url, headers=headers, timeout=30)
+            
+            if cached and response.status_code == 304:
+                channel_data = cached[1]
+            else:
+                response.raise_for_status()
+                channel_data = response.json()
+                etag = response.headers.get('ETag')
+                if etag:
+                    self._channel_cache[url] = (etag, channel_data)
             
-            channel_data = response.json()
             tracklists = []
             
-            # Process each block in the channel
+            # Collect each image block in the channel
             for block in channel_data.get('contents', []):
                 if block.get('class') == 'Image':
                     image_url = block.get('image', {}).get('display', {}).get('url')
                     if image_url:
-                        # For now, we'll store the image URL and extracted text
-                        # In a full implementation, you'd download and process the image
                         tracklist_data = {
                             'title': block.get('title', 'Untitled Tracklist'),
                             'url': image_url,
-                            'extracted_text': '',  # Would be filled by OCR processing
-                            'tracks': [],  # Would be filled by parsing
+                            'extracted_text': '',
+                            'tracks': [],
                             'are_na_id': block.get('id'),
                             'are_na_slug': block.get('slug')
                         }
                         tracklists.append(tracklist_data)
             
+            # Pipeline the images: a wide pool downloads and decodes them while a
+            # CPU-sized pool OCRs each one as soon as it is ready, so tesseract
+            # never waits on the network and never oversubscribes the cores
+            if tracklists:
+                ocr_workers = min(self.max_workers, os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=self.max_workers) as download_executor, \
+                        ThreadPoolExecutor(max_workers=ocr_workers) as ocr_executor:
+                    downloads = {
+                        download_executor.submit(self._download_image, tracklist_data['url']): tracklist_data
+                        for tracklist_data in tracklists
+                    }
+                    ocr_jobs = []
+                    for future in as_completed(downloads):
+                        tracklist_data = downloads[future]
+                        try:
+                            image = future.result()
+                        except Exception as e:
+                            logger.warning("⚠️  Error processing image %s: %s", tracklist_data['url'], e)
+                            continue
+                        ocr_jobs.append(ocr_executor.submit(self._ocr_tracklist_image, tracklist_data, image))
+                    
+                    for job in ocr_jobs:
+                        job.result()
+            
             return tracklists
             
         except Exception as e:
             raise Exception(f"Error processing Are.na channel {channel_slug}: {str(e)}")
     
+    async def process_are_na_channel_async(self, channel_slug: str) -> List[Dict]:
+        """
+        Process an Are.na channel from asyncio code without blocking the event loop.
+        
+        Args:
+            channel_slug: Are.na channel slug
+            
+        Returns:
+            List of tracklist data dictionaries
+        """
+        return await asyncio.to_thread(self.process_are_na_channel, channel_slug)
+    
+    def _ocr_tracklist_image(self, tracklist_data: Dict, image: Image.Image):
+        """Fill in the extracted text and tracks for a channel tracklist in place."""
+        try:
+            extracted_text = self._recognize(image).strip()
+        except Exception as e:
+            logger.warning("⚠️  Error processing image %s: %s", tracklist_data['url'], e)
+            return
+        
+        tracklist_data['extracted_text'] = extracted_text
+        tracklist_data['tracks'] = self.parse_tracks_from_text(extracted_text)
+    
     def save_tracklist_data(self, tracklist_data: Dict, output_file: str = "tracklist_data.json"):
         """
         Save tracklist data to a JSON file.
@@ -159,8 +379,16 @@ class OCRProcessor:
             output_file: Output file path
         """
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(tracklist_data, f, indent=2, ensure_ascii=False)
+            # Write next to the target and swap it in, so an interrupted save never
+            # leaves a truncated file behind
+            tmp_file = output_file + '.tmp'
+            if orjson:
+                with open(tmp_file, 'wb') as f:
+                    f.write(orjson.dumps(tracklist_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(tracklist_data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, output_file)
             print(f"✅ Tracklist data saved to {output_file}")
             
         except Exception as e:
@@ -177,8 +405,9 @@ class OCRProcessor:
             Dictionary containing tracklist data
         """
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(input_file, 'rb') as f:
+                raw = f.read()
+            return orjson.loads(raw) if orjson else json.loads(raw)
                 
         except FileNotFoundError:
             print(f"⚠️  File {input_file} not found")
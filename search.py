@@ -7,15 +7,27 @@ YouTube, Discogs, and other platforms.
 """
 
 import json
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from search_manager import SearchManager
 from load_env import load_env
 
+try:
+    # Optional: orjson reads and writes the tracklist JSON files several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
+# Tracks searched at once; each crawler still spaces out its own requests
+TRACK_SEARCH_WORKERS = 4
+
 def load_tracklists(input_file="extracted_tracklists.json"):
     """Load tracklists from JSON file."""
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(input_file, 'rb') as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson else json.loads(raw)
     except FileNotFoundError:
         print(f"Error: {input_file} not found")
         return None
@@ -27,18 +39,33 @@ def load_tracklists(input_file="extracted_tracklists.json"):
 def save_results(data, output_file="tracklists_enhanced.json"):
     """Save enhanced tracklist data to JSON file."""
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Write next to the target and swap it in, so an interrupted save never
+        # leaves a truncated file behind
+        tmp_file = output_file + '.tmp'
+        if orjson:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, output_file)
         print(f"✅ Results saved to {output_file}")
     except Exception as e:
         print(f"❌ Error saving results: {e}")
 
 
-def process_tracklists(tracklists, discogs_token=None, enable_discogs=True):
+def _track_name(track_info):
+    """Track name from either the old (string) or new (dict) track format."""
+    if isinstance(track_info, str):
+        return track_info
+    return track_info.get('track', str(track_info))
+
+
+def process_tracklists(tracklists, discogs_token=None, enable_discogs=True, min_confidence=0.3):
     """Process all tracklists and enhance with multi-platform search results."""
     
     # Initialize the search manager
-    manager = SearchManager(discogs_token=discogs_token)
+    manager = SearchManager(discogs_token=discogs_token, min_confidence=min_confidence)
     manager.enable_bandcamp()
     
     # Disable Discogs if requested
@@ -46,58 +73,83 @@ def process_tracklists(tracklists, discogs_token=None, enable_discogs=True):
         manager.disable_platform('discogs')
         print("ℹ️  Discogs disabled - using YouTube only")
     
+    # Connect to the enabled platforms while the tracklists are set up
+    manager.warm_up()
+    
     print(f"🎵 Processing {len(tracklists)} tracklist entries...")
-    print(f"🔍 Enabled platforms: {', '.join(manager.enabled_platforms)}")
+    # List platforms in the manager's crawler order; the enabled set has no order
+    enabled = [p for p in manager.crawlers if p in manager.enabled_platforms]
+    print(f"🔍 Enabled platforms: {', '.join(enabled)}")
     
     total_tracks = 0
     successful_searches = {'youtube': 0, 'discogs': 0}
     
-    for i, tracklist_entry in enumerate(tracklists):
-        print(f"\n{'='*80}")
-        print(f"📀 Tracklist {i+1}/{len(tracklists)}: {tracklist_entry.get('title', 'Unknown')}")
-        print(f"{'='*80}")
+    with ThreadPoolExecutor(max_workers=TRACK_SEARCH_WORKERS) as executor:
+        # Queue every track of every tracklist up front, searching each distinct
+        # name only once; results are reported and collected below in the
+        # original order as they complete
+        unique_futures = {}
+        track_futures = []
+        for tracklist_entry in tracklists:
+            futures = []
+            for track_info in tracklist_entry.get('tracks', []):
+                track_name = _track_name(track_info)
+                key = ' '.join(track_name.lower().split())
+                future = unique_futures.get(key)
+                if future is None:
+                    future = unique_futures[key] = executor.submit(manager.search_track, track_name)
+                futures.append(future)
+            track_futures.append(futures)
         
-        tracks = tracklist_entry.get('tracks', [])
-        if not tracks:
-            print("⚠️  No tracks found in this entry")
-            continue
-        
-        print(f"🎵 Processing {len(tracks)} tracks...")
-        
-        # Process each track
-        enhanced_tracks = []
-        for j, track_info in enumerate(tracks):
-            # Handle both old format (string) and new format (dict)
-            if isinstance(track_info, str):
-                track_name = track_info
-            else:
-                track_name = track_info.get('track', str(track_info))
+        for i, (tracklist_entry, futures) in enumerate(zip(tracklists, track_futures)):
+            print(f"\n{'='*80}")
+            print(f"📀 Tracklist {i+1}/{len(tracklists)}: {tracklist_entry.get('title', 'Unknown')}")
+            print(f"{'='*80}")
             
-            print(f"\n  {j+1}/{len(tracks)}. {track_name}")
-            total_tracks += 1
+            tracks = tracklist_entry.get('tracks', [])
+            if not tracks:
+                print("⚠️  No tracks found in this entry")
+                continue
             
-            # Search across all platforms
-            search_result = manager.search_track(track_name)
+            print(f"🎵 Processing {len(tracks)} tracks...")
             
-            # Count successful searches
-            for platform, result in search_result['platforms'].items():
-                if result['url']:
-                    successful_searches[platform] = successful_searches.get(platform, 0) + 1
-                    print(f"    ✅ {platform.title()}: Found")
-                else:
-                    print(f"    ❌ {platform.title()}: {result.get('error', 'Not found')}")
+            # Process each track
+            enhanced_tracks = []
+            for j, (track_info, future) in enumerate(zip(tracks, futures)):
+                track_name = _track_name(track_info)
+                
+                total_tracks += 1
+                
+                # Search across all platforms; repeated tracks share one search
+                search_result = {**future.result(), 'track': track_name}
+                
+                # Each track's report goes out in a single write, so it stays one
+                # block while crawler threads are logging
+                report = [f"\n  {j+1}/{len(tracks)}. {track_name}"]
+                
+                # Count successful searches
+                for platform, result in search_result['platforms'].items():
+                    if result['url']:
+                        successful_searches[platform] = successful_searches.get(platform, 0) + 1
+                        report.append(f"    ✅ {platform.title()}: Found")
+                    else:
+                        report.append(f"    ❌ {platform.title()}: {result.get('error', 'Not found')}")
+                
+                # Show best match
+                best = search_result['best_match']
+                if best['platform']:
+                    report.append(f"    🏆 Best match: {best['platform'].title()} (confidence: {best['confidence']:.2f})")
+                elif best['abstain']:
+                    report.append(f"    🤷 No confident match (best confidence: {best['confidence']:.2f})")
+                
+                print('\n'.join(report))
+                
+                enhanced_tracks.append(search_result)
             
-            # Show best match
-            best = search_result['best_match']
-            if best['platform']:
-                print(f"    🏆 Best match: {best['platform'].title()} (confidence: {best['confidence']:.2f})")
+            # Update the tracklist entry with enhanced tracks
+            tracklist_entry['tracks'] = enhanced_tracks
             
-            enhanced_tracks.append(search_result)
-        
-        # Update the tracklist entry with enhanced tracks
-        tracklist_entry['tracks'] = enhanced_tracks
-        
-        print(f"\n✅ Completed tracklist {i+1}")
+            print(f"\n✅ Completed tracklist {i+1}")
     
     # Print summary
     print(f"\n{'='*80}")
@@ -117,6 +169,10 @@ def main():
     print("🎵 Enhanced Multi-Platform Track Search")
     print("=" * 50)
     
+    # Crawler progress goes through logging, so searches on different threads
+    # write whole lines through one handler
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     # Load environment variables from .env file
     if load_env():
         print("🔧 Loaded environment variables from .env file")
@@ -142,8 +198,9 @@ def main():
     if not tracklists:
         return
     
-    # Process tracklists
-    enhanced_tracklists = process_tracklists(tracklists, discogs_token)
+    # Process tracklists; MIN_MATCH_CONFIDENCE tunes when a best match is picked
+    min_confidence = float(os.environ.get('MIN_MATCH_CONFIDENCE', 0.3))
+    enhanced_tracklists = process_tracklists(tracklists, discogs_token, min_confidence=min_confidence)
     
     # Save results
     save_results(enhanced_tracklists)
@@ -4,18 +4,35 @@ Search Manager
 Coordinates searches across multiple music platform crawlers.
 """
 
-from crawlers import YouTubeCrawler, DiscogsCrawler, BandcampCrawler
+import asyncio
+import copy
+import heapq
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import itemgetter
+from crawlers import (
+    YouTubeCrawler, DiscogsCrawler, BandcampCrawler,
+    search_all, search_all_async, collect_results, cancel_when_confident
+)
+
+logger = logging.getLogger(__name__)
 
 
 class SearchManager:
     """Manages searching across multiple music platform crawlers."""
     
-    def __init__(self, discogs_token: str = None):
+    def __init__(self, discogs_token: str = None, min_confidence: float = 0.3,
+                 early_exit_threshold: float = None):
         """
         Initialize search manager with available crawlers.
         
         Args:
             discogs_token: Optional Discogs API token for better rate limits
+            min_confidence: Raw confidence the best match needs to be picked
+                (compared before platform weighting, on every platform alike)
+            early_exit_threshold: Optional confidence at which a track's other
+                platforms are skipped (off by default, so every platform's link is found)
         """
         self.crawlers = {
             'youtube': YouTubeCrawler(delay_between_searches=1.5),
@@ -24,6 +41,26 @@ class SearchManager:
         }
         # Enable all platforms - Bandcamp now provides search URLs when blocked
         self.enabled_platforms = set(self.crawlers.keys())
+        
+        # How far each platform's confidence is trusted when picking the best
+        # match; platforms not listed count at full weight
+        self.platform_weights = {'youtube': 0.85, 'discogs': 1.0, 'bandcamp': 0.9}
+        self.min_confidence = min_confidence
+        self.early_exit_threshold = early_exit_threshold
+        
+        # Searches currently running, so concurrent calls for a track share one
+        self._in_flight = {}  # track -> Future of its search result
+        self._in_flight_lock = threading.Lock()
+    
+    def warm_up(self):
+        """
+        Warm up every enabled platform's connection in the background.
+        
+        Call right after creating the manager; by the time the first search
+        runs, DNS and TLS setup are usually already done.
+        """
+        for crawler in self._enabled_crawlers().values():
+            threading.Thread(target=crawler.warm_up, daemon=True).start()
     
     def enable_platform(self, platform: str):
         """Enable a specific platform for searching."""
@@ -38,10 +75,10 @@ class SearchManager:
         """Enable Bandcamp with a warning about potential blocking."""
         if 'bandcamp' in self.crawlers:
             self.enabled_platforms.add('bandcamp')
-            print("⚠️  Bandcamp enabled - may be blocked by anti-bot protection")
-            print("   If you get 403 errors, Bandcamp is blocking automated requests")
+            logger.warning("⚠️  Bandcamp enabled - may be blocked by anti-bot protection")
+            logger.info("   If you get 403 errors, Bandcamp is blocking automated requests")
         else:
-            print("Bandcamp crawler not available.")
+            logger.warning("Bandcamp crawler not available.")
     
     def search_track(self, track: str) -> dict:
         
@@ -55,38 +92,211 @@ class SearchManager:
             dict: {
                 'track': str,
                 'platforms': dict,
-                'best_match': dict
+                'best_match': dict,
+                'ranked': list of the top matches, best first
+            }
+        """
+        # A search for this track already running elsewhere is joined rather
+        # than sent to every platform again
+        future, owner = self._claim(track)
+        if not owner:
+            return copy.deepcopy(future.result())
+        
+        try:
+            # Query every enabled platform at once; each crawler keeps its own delay
+            results = search_all(track, self._enabled_crawlers(), stop_at=self.early_exit_threshold)
+            result = self._build_result(track, results)
+        except BaseException as e:
+            self._release(track, future, error=e)
+            raise
+        
+        self._release(track, future, result)
+        return result
+    
+    def search_tracks(self, tracks: list, max_workers: int = 4) -> list:
+        """
+        Search many tracks across all enabled platforms in one batch.
+        
+        Each platform works through the batch on its own small pool, so a
+        platform that spends most of its time waiting out its delay (like
+        Bandcamp) never holds up the others. Repeated tracks are searched once.
+        
+        Args:
+            tracks: Track names (usually "Artist - Track")
+            max_workers: Searches in flight at once on each platform
+            
+        Returns:
+            list: One search_track()-shaped result per track, in input order
+        """
+        crawlers = self._enabled_crawlers()
+        if not tracks:
+            return []
+        
+        # Tracks already being searched elsewhere are joined, not searched again
+        claims = {track: self._claim(track) for track in dict.fromkeys(tracks)}
+        owned = [track for track, (future, owner) in claims.items() if owner]
+        
+        unique_results = {}
+        executors = {
+            platform_name: ThreadPoolExecutor(max_workers=max_workers)
+            for platform_name in crawlers
+        }
+        try:
+            track_futures = {
+                track: {
+                    platform_name: executors[platform_name].submit(crawler.search, track)
+                    for platform_name, crawler in crawlers.items()
+                }
+                for track in owned
             }
+            if self.early_exit_threshold is not None:
+                for futures in track_futures.values():
+                    cancel_when_confident(futures, self.early_exit_threshold)
+            
+            for track, futures in track_futures.items():
+                result = self._build_result(track, collect_results(futures))
+                self._release(track, claims[track][0], result)
+                unique_results[track] = result
+        except BaseException as e:
+            for track in owned:
+                if track not in unique_results:
+                    self._release(track, claims[track][0], error=e)
+            raise
+        finally:
+            for executor in executors.values():
+                executor.shutdown()
+        
+        # Joined only once this batch's own searches are released, so two
+        # batches waiting on each other's tracks can't deadlock
+        for track, (future, owner) in claims.items():
+            if not owner:
+                unique_results[track] = copy.deepcopy(future.result())
+        
+        # Repeats get their own copy, so callers can change results independently
+        batch_results = []
+        seen = set()
+        for track in tracks:
+            result = unique_results[track]
+            batch_results.append(copy.deepcopy(result) if track in seen else result)
+            seen.add(track)
+        
+        return batch_results
+    
+    async def search_track_async(self, track: str) -> dict:
         """
-        results = {}
+        Asyncio counterpart of search_track(), for callers already on an event loop.
         
-        for platform_name in self.enabled_platforms:
-            if platform_name in self.crawlers:
-                crawler = self.crawlers[platform_name]
-                result = crawler.search(track)
-                results[platform_name] = result
-                
-                # Wait between different platform searches
-                if platform_name != list(self.enabled_platforms)[-1]:  # Don't wait after last platform
-                    crawler.wait()
+        Several tracks can be awaited together with asyncio.gather(); each
+        crawler still spaces out its own requests. Like search_track(), it
+        joins a search for the same track that is already running.
         
+        Args:
+            track: Track name (usually "Artist - Track")
+            
+        Returns:
+            dict: Same shape as search_track()
+        """
+        future, owner = self._claim(track)
+        if not owner:
+            return copy.deepcopy(await asyncio.wrap_future(future))
+        
+        try:
+            results = await search_all_async(track, self._enabled_crawlers(), stop_at=self.early_exit_threshold)
+            result = self._build_result(track, results)
+        except BaseException as e:
+            self._release(track, future, error=e)
+            raise
+        
+        self._release(track, future, result)
+        return result
+    
+    def _claim(self, track: str):
+        """
+        Join the running search for a track, or register a new one.
+        
+        Returns:
+            tuple: (Future of the track's result, True if the caller must run
+                the search and then _release() it)
+        """
+        with self._in_flight_lock:
+            future = self._in_flight.get(track)
+            if future is not None:
+                return future, False
+            future = self._in_flight[track] = Future()
+            return future, True
+    
+    def _release(self, track: str, future: Future, result: dict = None, error: BaseException = None):
+        """Finish a claimed search, handing its outcome to any callers that joined it."""
+        with self._in_flight_lock:
+            del self._in_flight[track]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            # Joining callers copy from a snapshot the owner's caller can't change
+            future.set_result(copy.deepcopy(result))
+    
+    def _enabled_crawlers(self) -> dict:
+        """Enabled crawlers by platform name, in a stable platform order."""
+        # Walking the crawlers dict (not the set) keeps platform order stable
+        return {
+            platform_name: crawler
+            for platform_name, crawler in self.crawlers.items()
+            if platform_name in self.enabled_platforms
+        }
+    
+    def _build_result(self, track: str, platform_results: dict) -> dict:
+        """Assemble a track's search result from its per-platform results."""
         return {
             'track': track,
-            'platforms': results,
-            'best_match': self._find_best_match(results)
+            'platforms': platform_results,
+            'best_match': self._find_best_match(platform_results),
+            'ranked': self._rank_matches(platform_results)
         }
     
+    def _scored_matches(self, platform_results: dict):
+        """Yield (platform, confidence, weighted score) for each result with a match."""
+        weights = self.platform_weights
+        for platform, result in platform_results.items():
+            confidence = result['confidence']
+            if result['url'] and confidence > 0:
+                yield platform, confidence, confidence * weights.get(platform, 1.0)
+    
     def _find_best_match(self, platform_results: dict) -> dict:
-        """Find the platform result with the highest confidence."""
-        best_platform = None
-        best_confidence = 0.0
+        """
+        Find the platform result with the highest weighted confidence.
         
-        for platform, result in platform_results.items():
-            if result['url'] and result['confidence'] > best_confidence:
-                best_confidence = result['confidence']
-                best_platform = platform
+        Abstains (platform None, 'abstain' True) when the best match's raw
+        confidence is below min_confidence, rather than picking a likely wrong
+        one. Weights only rank the platforms; they don't move the threshold.
+        """
+        # max() keeps the first of equal scores, so earlier platforms win ties
+        best = max(self._scored_matches(platform_results), key=itemgetter(2), default=None)
         
-        return {
-            'platform': best_platform,
-            'confidence': best_confidence
-        } if best_platform else {'platform': None, 'confidence': 0.0}
+        if best is None:
+            return {'platform': None, 'confidence': 0.0, 'score': 0.0, 'abstain': False}
+        platform, confidence, score = best
+        if confidence < self.min_confidence:
+            return {'platform': None, 'confidence': confidence, 'score': score, 'abstain': True}
+        return {'platform': platform, 'confidence': confidence, 'score': score, 'abstain': False}
+    
+    def _rank_matches(self, platform_results: dict, k: int = 3) -> list:
+        """
+        Rank the platform results that found a match, best first.
+        
+        Lets callers offer the runner-up matches when the best one is wrong,
+        without searching again. Matches below min_confidence are kept here
+        even when best_match abstains.
+        
+        Args:
+            platform_results: Mapping of platform name to search result
+            k: Maximum number of matches to keep
+            
+        Returns:
+            list: Up to k {'platform', 'confidence', 'score'} dicts, highest score first
+        """
+        # nlargest() keeps equal scores in platform order, like _find_best_match
+        top = heapq.nlargest(k, self._scored_matches(platform_results), key=itemgetter(2))
+        return [
+            {'platform': platform, 'confidence': confidence, 'score': score}
+            for platform, confidence, score in top
+        ]
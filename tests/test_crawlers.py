@@ -0,0 +1,99 @@
+"""
+Tests for the shared crawler machinery: concurrent search and request spacing.
+"""
+
+import time
+import unittest
+
+from crawlers import BaseCrawler, BandcampCrawler, search_all
+
+
+class FakeCrawler(BaseCrawler):
+    """A crawler that answers after a fixed time without touching the network."""
+    
+    def __init__(self, confidence: float, seconds: float = 0.0):
+        super().__init__("Fake", delay_between_searches=0.0)
+        self.confidence = confidence
+        self.seconds = seconds
+    
+    def clean_query(self, query: str) -> str:
+        return query
+    
+    def search(self, query: str) -> dict:
+        time.sleep(self.seconds)
+        return self._result('https://example.com/' + query, self.confidence)
+
+
+class SearchAllTest(unittest.TestCase):
+    """search_all() waits for every platform unless stop_at is reached."""
+    
+    def test_waits_for_every_platform_by_default(self):
+        crawlers = {'fast': FakeCrawler(0.9), 'slow': FakeCrawler(0.5, seconds=0.2)}
+        
+        results = search_all('a', crawlers)
+        
+        self.assertEqual(list(results), ['fast', 'slow'])
+        self.assertEqual(results['slow']['confidence'], 0.5)
+        self.assertIsNone(results['slow']['error'])
+    
+    def test_stop_at_returns_without_the_slow_platform(self):
+        crawlers = {'slow': FakeCrawler(0.5, seconds=1.0), 'fast': FakeCrawler(0.9)}
+        
+        started = time.monotonic()
+        results = search_all('a', crawlers, stop_at=0.8)
+        
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(list(results), ['slow', 'fast'])
+        self.assertEqual(results['fast']['confidence'], 0.9)
+        self.assertIsNone(results['slow']['url'])
+        self.assertTrue(results['slow']['error'].startswith('Not awaited'))
+    
+    def test_stop_at_not_reached_waits_for_every_platform(self):
+        crawlers = {'fast': FakeCrawler(0.5), 'slow': FakeCrawler(0.6, seconds=0.2)}
+        
+        results = search_all('a', crawlers, stop_at=0.8)
+        
+        self.assertEqual(results['slow']['confidence'], 0.6)
+
+
+class RequestSlotTest(unittest.TestCase):
+    """_reserve_request_slot() lets REQUEST_BURST requests through, then spaces them."""
+    
+    DELAY = 10.0  # long enough that time spent in the test doesn't show
+    
+    def _waits(self, crawler, count: int) -> list:
+        return [crawler._reserve_request_slot() for _ in range(count)]
+    
+    def test_burst_then_delay_spacing(self):
+        crawler = FakeCrawler(0.0)
+        crawler.delay = self.DELAY
+        
+        waits = self._waits(crawler, 5)
+        
+        self.assertEqual(crawler.REQUEST_BURST, 3)
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], self.DELAY, delta=0.5)
+        self.assertAlmostEqual(waits[4], 2 * self.DELAY, delta=0.5)
+    
+    def test_bandcamp_has_no_burst(self):
+        crawler = BandcampCrawler(delay_between_searches=self.DELAY)
+        
+        waits = self._waits(crawler, 3)
+        
+        self.assertEqual(waits[0], 0.0)
+        self.assertAlmostEqual(waits[1], self.DELAY, delta=0.5)
+        self.assertAlmostEqual(waits[2], 2 * self.DELAY, delta=0.5)
+    
+    def test_idle_time_refills_the_burst(self):
+        crawler = FakeCrawler(0.0)
+        crawler.delay = self.DELAY
+        self._waits(crawler, 5)
+        
+        # As if the crawler had been idle long enough for every slot to expire
+        crawler._next_request_at = time.monotonic() - self.DELAY
+        
+        self.assertEqual(self._waits(crawler, 3), [0.0, 0.0, 0.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for SearchManager's best-match selection and search coalescing.
+"""
+
+import threading
+import time
+import unittest
+from collections import Counter
+
+from crawlers import BaseCrawler
+from search_manager import SearchManager
+
+
+def _match(confidence: float) -> dict:
+    """A platform result that found something at the given confidence."""
+    return {'url': 'https://example.com/track', 'confidence': confidence, 'metadata': {}, 'error': None}
+
+
+class FindBestMatchTest(unittest.TestCase):
+    """Abstaining compares raw confidence, whatever the platform's weight."""
+    
+    def setUp(self):
+        self.manager = SearchManager(min_confidence=0.3)
+    
+    def test_weighted_platform_at_threshold_is_picked(self):
+        # YouTube is weighted 0.85, so its score (0.255) is below the threshold
+        best = self.manager._find_best_match({'youtube': _match(0.3)})
+        
+        self.assertEqual(best['platform'], 'youtube')
+        self.assertFalse(best['abstain'])
+        self.assertAlmostEqual(best['score'], 0.3 * 0.85)
+    
+    def test_weighted_platform_below_threshold_abstains(self):
+        best = self.manager._find_best_match({'youtube': _match(0.29)})
+        
+        self.assertIsNone(best['platform'])
+        self.assertTrue(best['abstain'])
+        self.assertEqual(best['confidence'], 0.29)
+    
+    def test_weights_still_rank_platforms(self):
+        best = self.manager._find_best_match({'youtube': _match(0.9), 'discogs': _match(0.8)})
+        
+        self.assertEqual(best['platform'], 'discogs')
+
+
+class CountingCrawler(BaseCrawler):
+    """A crawler that counts its searches and answers after a short pause."""
+    
+    def __init__(self, seconds: float = 0.2):
+        super().__init__("Counting", delay_between_searches=0.0)
+        self.seconds = seconds
+        self.calls = Counter()
+        self._calls_lock = threading.Lock()
+    
+    def clean_query(self, query: str) -> str:
+        return query
+    
+    def search(self, query: str) -> dict:
+        with self._calls_lock:
+            self.calls[query] += 1
+        time.sleep(self.seconds)
+        return self._result('https://example.com/' + query, 0.9, title=query)
+
+
+class CoalescingTest(unittest.TestCase):
+    """Searches for the same track share one request per platform."""
+    
+    def setUp(self):
+        self.manager = SearchManager()
+        self.manager.crawlers = {'youtube': CountingCrawler(), 'discogs': CountingCrawler()}
+        self.manager.enabled_platforms = set(self.manager.crawlers)
+    
+    def assertSearchedOnce(self, *tracks):
+        for crawler in self.manager.crawlers.values():
+            self.assertEqual(crawler.calls, Counter(tracks))
+    
+    def test_concurrent_search_track_calls_share_one_search(self):
+        results = [None] * 4
+        
+        def search(i):
+            results[i] = self.manager.search_track('A - B')
+        
+        threads = [threading.Thread(target=search, args=(i,)) for i in range(len(results))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertSearchedOnce('A - B')
+        self.assertEqual(results[0]['platforms']['discogs']['url'], 'https://example.com/A - B')
+        for result in results[1:]:
+            self.assertEqual(result, results[0])
+            self.assertIsNot(result, results[0])
+        self.assertEqual(self.manager._in_flight, {})
+    
+    def test_search_track_searches_again_once_finished(self):
+        self.manager.search_track('A - B')
+        self.manager.search_track('A - B')
+        
+        for crawler in self.manager.crawlers.values():
+            self.assertEqual(crawler.calls['A - B'], 2)
+    
+    def test_search_tracks_searches_repeats_once_in_input_order(self):
+        tracks = ['A - B', 'C - D', 'A - B', 'E - F']
+        
+        results = self.manager.search_tracks(tracks)
+        
+        self.assertSearchedOnce('A - B', 'C - D', 'E - F')
+        self.assertEqual([result['track'] for result in results], tracks)
+        self.assertEqual(results[2], results[0])
+    
+    def test_search_tracks_repeats_are_independent_copies(self):
+        results = self.manager.search_tracks(['A - B', 'A - B'])
+        
+        results[0]['platforms']['youtube']['metadata']['title'] = 'changed'
+        
+        self.assertEqual(results[1]['platforms']['youtube']['metadata']['title'], 'A - B')
+    
+    def test_search_tracks_joins_a_running_search_track(self):
+        thread = threading.Thread(target=self.manager.search_track, args=('A - B',))
+        thread.start()
+        time.sleep(0.05)
+        
+        results = self.manager.search_tracks(['A - B', 'C - D'])
+        thread.join()
+        
+        self.assertSearchedOnce('A - B', 'C - D')
+        self.assertEqual([result['track'] for result in results], ['A - B', 'C - D'])
+
+
+if __name__ == '__main__':
+    unittest.main()